@@ -1,5 +1,5 @@
 """A2A SDK for agent-to-agent communication in BankX."""
-from .client import A2AClient, A2AConfig, RegistryClient
+from .client import A2AClient, A2AConfig, RegistryClient, CachingRegistryClient
 from .models import A2AMessage, A2AResponse, AgentIdentifier, A2AMetadata
 from .utils import CircuitBreaker, CircuitBreakerError
 
@@ -9,6 +9,7 @@ __all__ = [
     "A2AClient",
     "A2AConfig",
     "RegistryClient",
+    "CachingRegistryClient",
     "A2AMessage",
     "A2AResponse",
     "AgentIdentifier",
@@ -1,5 +1,6 @@
 """A2A SDK client modules."""
 from .a2a_client import A2AClient, A2AConfig
 from .registry_client import RegistryClient
+from .caching_registry_client import CachingRegistryClient
 
-__all__ = ["A2AClient", "A2AConfig", "RegistryClient"]
+__all__ = ["A2AClient", "A2AConfig", "RegistryClient", "CachingRegistryClient"]
@@ -1,6 +1,7 @@
 """A2A client for agent-to-agent communication."""
 import asyncio
 import logging
+import random
 from datetime import datetime
 from typing import Dict, Optional
 
@@ -8,12 +9,14 @@ import httpx
 from opentelemetry import trace
 
 from ..models import A2AMessage, A2AResponse, AgentIdentifier, A2AMetadata
-from ..utils import CircuitBreaker, CircuitBreakerError
+from ..utils import CircuitBreaker, CircuitBreakerError, CircuitState
 from .registry_client import RegistryClient
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class A2AConfig:
     """Configuration for A2A client."""
@@ -23,6 +26,7 @@ class A2AConfig:
         timeout_seconds: int = 30,
         max_retries: int = 3,
         retry_backoff_seconds: int = 2,
+        max_backoff_seconds: int = 8,
         circuit_breaker_threshold: int = 5,
         circuit_breaker_timeout_seconds: int = 60,
         enable_tracing: bool = True,
@@ -33,6 +37,7 @@ class A2AConfig:
             timeout_seconds: Request timeout
             max_retries: Maximum retry attempts
             retry_backoff_seconds: Base backoff time for retries
+            max_backoff_seconds: Cap on the backoff between retries
             circuit_breaker_threshold: Failures before opening circuit
             circuit_breaker_timeout_seconds: Circuit breaker timeout
             enable_tracing: Enable distributed tracing
@@ -40,6 +45,7 @@ class A2AConfig:
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
         self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
         self.circuit_breaker_threshold = circuit_breaker_threshold
         self.circuit_breaker_timeout_seconds = circuit_breaker_timeout_seconds
         self.enable_tracing = enable_tracing
@@ -210,10 +216,12 @@ class A2AClient:
         )
 
         # Retry logic with exponential backoff
+        span = trace.get_current_span()
         last_exception = None
         for attempt in range(self.config.max_retries):
             try:
                 message.metadata.retry_count = attempt
+                span.set_attribute("retry.attempt", attempt)
 
                 logger.debug(
                     f"Sending A2A message to {target_agent_name} "
@@ -222,9 +230,11 @@ class A2AClient:
 
                 # Send HTTP request
                 start_time = datetime.utcnow()
+                # Serialize straight to JSON bytes in pydantic-core, without an intermediate dict + json.dumps pass
                 response = await self._http_client.post(
                     target_endpoint,
-                    json=message.model_dump(mode='json'),
+                    content=message.model_dump_json(),
+                    headers=JSON_HEADERS,
                     timeout=self.config.timeout_seconds,
                 )
                 end_time = datetime.utcnow()
@@ -238,6 +248,7 @@ class A2AClient:
 
                 # Record success in circuit breaker
                 circuit_breaker.record_success()
+                span.set_attribute("breaker.state", circuit_breaker.state.value)
 
                 logger.info(
                     f"A2A call successful: {self.agent_name} -> {target_agent_name} "
@@ -261,11 +272,14 @@ class A2AClient:
 
             except httpx.HTTPStatusError as e:
                 last_exception = e
-                circuit_breaker.record_failure()
                 logger.error(
                     f"A2A HTTP error: {self.agent_name} -> {target_agent_name} "
                     f"(status: {e.response.status_code}, attempt {attempt + 1})"
                 )
+                if not self._is_transient_status(e.response.status_code):
+                    # Permanent error (bad request, auth, not found): retrying cannot succeed
+                    break
+                circuit_breaker.record_failure()
 
             except Exception as e:
                 last_exception = e
@@ -275,23 +289,43 @@ class A2AClient:
                     f"(attempt {attempt + 1}): {str(e)}"
                 )
 
-            # Exponential backoff before retry
+            span.set_attribute("breaker.state", circuit_breaker.state.value)
+            if circuit_breaker.state == CircuitState.OPEN:
+                # Circuit opened during this call: fail fast instead of waiting out the remaining retries
+                break
+
+            # Capped exponential backoff with ±10% jitter so concurrent callers do not retry in lockstep
             if attempt < self.config.max_retries - 1:
-                backoff_time = self.config.retry_backoff_seconds * (2**attempt)
-                logger.debug(f"Retrying in {backoff_time} seconds...")
+                backoff_time = min(
+                    self.config.retry_backoff_seconds * (2**attempt),
+                    self.config.max_backoff_seconds,
+                ) * random.uniform(0.9, 1.1)
+                logger.debug(f"Retrying in {backoff_time:.2f} seconds...")
                 await asyncio.sleep(backoff_time)
 
         # All retries failed
         logger.error(
-            f"A2A call failed after {self.config.max_retries} attempts: "
+            f"A2A call failed after {attempt + 1} attempts: "
             f"{self.agent_name} -> {target_agent_name}"
         )
 
         raise Exception(
-            f"Failed to send A2A message after {self.config.max_retries} attempts: "
+            f"Failed to send A2A message after {attempt + 1} attempts: "
             f"{str(last_exception)}"
         )
 
+    @staticmethod
+    def _is_transient_status(status_code: int) -> bool:
+        """Whether an HTTP error status is worth retrying.
+
+        Args:
+            status_code: HTTP status code
+
+        Returns:
+            True for server errors, timeouts and throttling
+        """
+        return status_code >= 500 or status_code in (408, 429)
+
     async def close(self):
         """Close the HTTP client."""
         await self._http_client.aclose()
@@ -0,0 +1,115 @@
+"""Caching proxy for the Agent Registry client."""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .registry_client import RegistryClient
+
+logger = logging.getLogger(__name__)
+
+
+class CachingRegistryClient:
+    """Registry client that memoises discovery results for a short TTL.
+
+    Discovery results are kept per capability and re-fetched by the first call
+    after they expire, so A2A calls resolve their target without a registry
+    round-trip. Other registry operations are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        registry_client: RegistryClient,
+        ttl_seconds: float = 30.0,
+        prewarm_capabilities: Optional[List[str]] = None,
+    ):
+        """Initialize caching registry client.
+
+        Args:
+            registry_client: Underlying registry client
+            ttl_seconds: How long a discovery result is served from cache
+            prewarm_capabilities: Capabilities resolved by prewarm()
+        """
+        self.registry_client = registry_client
+        self.ttl_seconds = ttl_seconds
+        self.prewarm_capabilities = list(prewarm_capabilities or [])
+
+        self._entries: Dict[Tuple, Tuple[List[dict], float]] = {}
+        self._locks: Dict[Tuple, asyncio.Lock] = {}
+
+    def __getattr__(self, name):
+        # register, heartbeat, deregister, ... go straight to the wrapped client
+        return getattr(self.registry_client, name)
+
+    @staticmethod
+    def _key(capability, agent_type, status, tags) -> Tuple:
+        return (capability, agent_type, status, tuple(tags or ()))
+
+    async def discover(
+        self,
+        capability: Optional[str] = None,
+        agent_type: Optional[str] = None,
+        status: str = "active",
+        tags: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """Discover agents matching criteria, served from cache while fresh.
+
+        Args:
+            capability: Filter by capability
+            agent_type: Filter by agent type
+            status: Filter by status (default: active)
+            tags: Filter by tags
+
+        Returns:
+            List of matching agents
+        """
+        key = self._key(capability, agent_type, status, tags)
+        agents = self._fresh(key)
+        if agents is not None:
+            return agents
+
+        # One registry round-trip per expired key; concurrent callers wait for it
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            agents = self._fresh(key)
+            if agents is not None:
+                return agents
+            agents = await self.registry_client.discover(
+                capability=capability, agent_type=agent_type, status=status, tags=tags
+            )
+            if agents:
+                self._entries[key] = (agents, time.monotonic())
+            return agents
+
+    def _fresh(self, key: Tuple) -> Optional[List[dict]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            return entry[0]
+        return None
+
+    async def prewarm(self):
+        """Resolve the configured prewarm capabilities so the first A2A calls hit the cache."""
+        for capability in self.prewarm_capabilities:
+            try:
+                await self.discover(capability=capability)
+            except Exception as e:
+                # Best effort; discover() resolves the capability again on first use
+                logger.warning(f"Failed to prewarm registry cache for {capability}: {e}")
+
+    def invalidate(self, capability: Optional[str] = None):
+        """Drop cached discovery results for a capability (all capabilities if None).
+
+        Call this when a send to a discovered endpoint fails so the next call
+        resolves a fresh endpoint.
+        """
+        if capability is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == capability]:
+            del self._entries[key]
+
+    async def close(self):
+        """Close the wrapped client."""
+        await self.registry_client.close()
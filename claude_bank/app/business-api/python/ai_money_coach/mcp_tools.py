@@ -7,6 +7,7 @@ from typing import Optional, Dict, Any
 
 from fastmcp import FastMCP
 from models import MoneyCoachSearchResult, GroundingValidationResult
+from playbook import COACH_PLAYBOOK
 from services import MoneyCoachAISearchService, MoneyCoachContentUnderstandingService
 
 # Add app directory to path for common imports
@@ -27,6 +28,25 @@ def register_tools(
 ):
     """Register all MCP tools for AIMoneyCoach agent."""
 
+    @mcp.tool()
+    async def get_coach_playbook() -> str:
+        """
+        Get the AIMoneyCoach playbook: book chapter list, tool result formats,
+        a worked example and the support ticket procedure.
+
+        Call this once at the start of a new conversation, before answering.
+
+        Returns:
+            The long-form coaching guidance as text
+        """
+        logger.info("[MCP Tool] get_coach_playbook")
+
+        with trace_mcp_tool(
+            tool_name="get_coach_playbook",
+            attributes={"use_case": "UC3"}
+        ):
+            return COACH_PLAYBOOK
+
     @mcp.tool()
     async def ai_search_rag_results(
         query: str,
@@ -263,4 +283,4 @@ def register_tools(
                     "error": str(e)
                 }
 
-    logger.info("Registered 2 MCP tools for AIMoneyCoach agent")
+    logger.info("Registered MCP tools for AIMoneyCoach agent")
@@ -1,8 +1,10 @@
 from agent_framework.azure import AzureOpenAIChatClient
-from agent_framework import ChatAgent, MCPStreamableHTTPTool
+from agent_framework import ChatAgent
+from app.tools.mcp_tool_registry import get_mcp_tool_registry
+from app.utils.http_client import get_shared_http_client
 from typing import Optional, Dict, Any
+import asyncio
 import logging
-import httpx
 import os
 
 logger = logging.getLogger(__name__)
@@ -273,6 +275,9 @@ class ProdInfoFAQAgent:
         self.escalation_comms_agent = escalation_comms_agent
         # A2A endpoint for EscalationComms agent
         self.escalation_comms_a2a_url = os.getenv("ESCALATION_COMMS_A2A_URL", "http://localhost:8104/a2a/invoke")
+        # In-flight ticket notifications, so coincident calls for one ticket share a single POST
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_lock = asyncio.Lock()
 
     async def send_ticket_notification_email(
         self,
@@ -302,55 +307,92 @@ class ProdInfoFAQAgent:
         Returns:
             Email confirmation response
         """
-        logger.info(f"Calling EscalationComms agent via A2A for ticket {ticket_id}")
+        async with self._inflight_lock:
+            inflight = self._inflight.get(ticket_id)
+            if inflight is None:
+                inflight = asyncio.get_running_loop().create_future()
+                self._inflight[ticket_id] = inflight
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            logger.info("Joining in-flight EscalationComms A2A call for ticket %s", ticket_id)
+            return await asyncio.shield(inflight)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Build A2A message
-                a2a_message = {
-                    "message_id": f"msg-{ticket_id}",
-                    "correlation_id": ticket_id,
-                    "protocol_version": "1.0",
-                    "timestamp": None,  # Will be set by server
-                    "source": {
-                        "agent_id": "prodinfo-faq-agent",
-                        "agent_name": "ProdInfoFAQAgent"
-                    },
-                    "target": {
-                        "agent_id": "escalation-comms-agent",
-                        "agent_name": "EscalationCommsAgent"
-                    },
-                    "intent": "escalation.send_ticket_email",
-                    "payload": {
-                        "ticket_id": ticket_id,
-                        "customer_email": customer_email,
-                        "customer_name": customer_name,
-                        "customer_id": customer_id,
-                        "query": query,
-                        "category": category,
-                        "priority": priority
-                    },
-                    "metadata": {
-                        "timeout_seconds": 30,
-                        "retry_count": 0
-                    }
+            result = await self._post_ticket_notification(
+                ticket_id, customer_email, customer_name, customer_id, query, category, priority
+            )
+            inflight.set_result(result)
+            return result
+        finally:
+            if not inflight.done():
+                inflight.cancel()
+            async with self._inflight_lock:
+                self._inflight.pop(ticket_id, None)
+
+    async def _post_ticket_notification(
+        self,
+        ticket_id: str,
+        customer_email: str,
+        customer_name: str,
+        customer_id: str,
+        query: str,
+        category: str,
+        priority: str
+    ) -> Dict[str, Any]:
+        """POST the ticket notification A2A message to the EscalationComms agent."""
+        logger.info("Calling EscalationComms agent via A2A for ticket %s", ticket_id)
+
+        try:
+            client = get_shared_http_client()
+            # Build A2A message
+            a2a_message = {
+                "message_id": f"msg-{ticket_id}",
+                "correlation_id": ticket_id,
+                "protocol_version": "1.0",
+                "timestamp": None,  # Will be set by server
+                "source": {
+                    "agent_id": "prodinfo-faq-agent",
+                    "agent_name": "ProdInfoFAQAgent"
+                },
+                "target": {
+                    "agent_id": "escalation-comms-agent",
+                    "agent_name": "EscalationCommsAgent"
+                },
+                "intent": "escalation.send_ticket_email",
+                "payload": {
+                    "ticket_id": ticket_id,
+                    "customer_email": customer_email,
+                    "customer_name": customer_name,
+                    "customer_id": customer_id,
+                    "query": query,
+                    "category": category,
+                    "priority": priority
+                },
+                "metadata": {
+                    "timeout_seconds": 30,
+                    "retry_count": 0
                 }
+            }
 
-                # Send A2A request
-                response = await client.post(
-                    self.escalation_comms_a2a_url,
-                    json=a2a_message
-                )
-                response.raise_for_status()
-                result = response.json()
+            # Send A2A request
+            response = await client.post(
+                self.escalation_comms_a2a_url,
+                json=a2a_message,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            result = response.json()
 
-                logger.info(f"EscalationComms A2A call successful: {result.get('status')}")
+            logger.info("EscalationComms A2A call successful: %s", result.get("status"))
 
-                # Return the response payload
-                return result.get("response", {})
+            # Return the response payload
+            return result.get("response", {})
 
         except Exception as e:
-            logger.error(f"Failed to call EscalationComms via A2A: {e}")
+            logger.error("Failed to call EscalationComms via A2A: %s", e)
             return {
                 "type": "EMAIL_ERROR",
                 "error": str(e),
@@ -368,12 +410,21 @@ class ProdInfoFAQAgent:
 
         # Add ProdInfoFAQ MCP server if provided
         if self.prodinfo_faq_mcp_server_url:
-            logger.info("Initializing ProdInfoFAQ MCP server tools (Azure AI Search + CosmosDB)")
-            prodinfo_faq_mcp_server = MCPStreamableHTTPTool(
-                name="ProdInfoFAQ MCP server client",
-                url=self.prodinfo_faq_mcp_server_url
-            )
-            await prodinfo_faq_mcp_server.connect()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Initializing ProdInfoFAQ MCP server tools (Azure AI Search + CosmosDB)")
+            try:
+                prodinfo_faq_mcp_server = await get_mcp_tool_registry().get(
+                    name="ProdInfoFAQ MCP server client",
+                    url=self.prodinfo_faq_mcp_server_url
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to connect ProdInfoFAQ MCP server at %s: %s",
+                    self.prodinfo_faq_mcp_server_url,
+                    e,
+                    exc_info=True,
+                )
+                raise
             tools_list.append(prodinfo_faq_mcp_server)
 
         # Add A2A function tool for calling EscalationComms agent
@@ -1,21 +1,93 @@
-from typing import Any, AsyncGenerator
-from agent_framework import ChatAgent
+from typing import Any, AsyncGenerator, Final
+from agent_framework import ChatAgent, ChatMessage
 from agent_framework.exceptions import AgentThreadException
 from agent_framework.azure import AzureOpenAIChatClient
 from app.agents.azure_chat.account_agent import AccountAgent
-from app.agents.azure_chat.transaction_agent import TransactionHistoryAgent
+from app.agents.azure_chat.transaction_agent import TransactionAgent
 from app.agents.azure_chat.payment_agent import PaymentAgent
 from app.agents.azure_chat.prodinfo_faq_agent import ProdInfoFAQAgent
 from app.agents.azure_chat.ai_money_coach_agent import AIMoneyCoachAgent
+from app.cache.agent_cache import AgentCache
+from app.cache.thread_store import ThreadStore, get_thread_store
+from app.cache.response_cache import ResponseCache, get_response_cache
+from app.config.settings import settings
+from app.tools.mcp_tool_registry import get_mcp_tool_registry
+from app.utils.background_log import BackgroundLogQueue
 from uuid import uuid4
+from contextvars import ContextVar
+import asyncio
 import logging
+import re
+import sys
 
 
 logger = logging.getLogger(__name__)
 
-class SupervisorAgent :
-
-    instructions = """
+# Routing decisions are logged for governance from a background task, off the request path
+_routing_log = BackgroundLogQueue(logging.getLogger(f"{__name__}.routing"))
+
+# Request-scoped state read by the route_to_* tools: {"user_message": original user message, "thread": shared agent thread, "thread_id": ...}.
+# Tools record the sub-agent they routed to under "route".
+# A ContextVar (not instance attributes) so one SupervisorAgent can serve concurrent requests without swapping threads.
+_REQ_CTX: ContextVar[dict[str, Any]] = ContextVar("supervisor_request_context")
+
+# Bounds concurrent sub-agent runs against Azure OpenAI across all requests, queueing instead of triggering 429s.
+# Only the leaf sub-agent runs take a permit: the supervisor run wraps them, so holding a permit there too could deadlock.
+_AZURE_SEM: Final[asyncio.Semaphore] = asyncio.Semaphore(settings.AZURE_OPENAI_MAX_CONCURRENCY)
+
+# Deterministic intents routed locally, without a supervisor LLM call: (pattern, exclusion pattern, route_to_* tool name).
+# A pattern only counts when its exclusion does not also match, and a route is only taken when exactly one
+# pattern counts; anything ambiguous falls through to the LLM router.
+_FAST_ROUTES: Final[tuple[tuple[re.Pattern[str], re.Pattern[str] | None, str], ...]] = (
+    (
+        re.compile(r"\bmy (account )?balances?\b|\b(transfer|daily|my) limits?\b|\baccount details\b", re.I),
+        # Product questions about balances and limits ("minimum balance for current account") are FAQs
+        re.compile(r"\b(minimum|interest|fees?|open(ing)?|products?)\b", re.I),
+        "route_to_account_agent",
+    ),
+    (re.compile(r"\b(transactions?|spent|spending|paid|history)\b|\bhow much did i\b", re.I), None, "route_to_transaction_agent"),
+    (
+        # Imperative transfer with an amount: "Transfer 1000 THB to Nattaporn", "Pay 500 to Somchai"
+        re.compile(r"^\s*(please\s+)?(transfer|send|pay)\s+\d[\d,.]*\s*(thb|baht)?\s+to\s+\w+", re.I),
+        # Questions about past payments belong to the transaction history
+        re.compile(r"\b(did|last|history|previous)\b", re.I),
+        "route_to_payment_agent",
+    ),
+    (
+        re.compile(r"\bwhat is an? (current|savings|fixed) account\b|\bminimum balance\b|\binterest rates?\b|\btime deposits?\b|\bwithholding tax\b", re.I),
+        None,
+        "route_to_prodinfo_faq_agent",
+    ),
+    (re.compile(r"\b(debts?|debt-free|emergency fund|consolidate)\b", re.I), None, "route_to_ai_money_coach_agent"),
+)
+
+
+def _fast_route_name(user_message: str) -> str | None:
+    """Return the route_to_* tool name for an unambiguous deterministic intent, or None."""
+    matches = [
+        name
+        for pattern, exclusion, name in _FAST_ROUTES
+        if pattern.search(user_message) and not (exclusion and exclusion.search(user_message))
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+# Short continuations ("what about last month?", "yes, proceed") that stay with the previously routed sub-agent
+_FOLLOWUP_RE: Final[re.Pattern[str]] = re.compile(
+    r"^\s*(what about|how about|and\b|also\b|same for|yes\b|yeah\b|no\b|ok(ay)?\b|confirm|proceed|go ahead)", re.I
+)
+_FOLLOWUP_MAX_WORDS: Final[int] = 8
+
+# Routes whose answers come from static knowledge (product docs, coaching book) and can be served from the response cache
+_CACHEABLE_ROUTES: Final[frozenset[str]] = frozenset({"prodinfo_faq", "ai_money_coach"})
+# Shorter messages ("yes", "tell me more") only make sense in context, so they are never cached or served from cache
+_CACHE_MIN_WORDS: Final[int] = 4
+
+# Sub-agent prompts embed the current timestamp at build time, so built sub-agents are rebuilt after this many seconds
+_SUB_AGENT_TTL_SECONDS: Final[float] = 300.0
+
+# Routing instructions are static: built and interned once at import so every agent build shares the same object.
+_INSTRUCTIONS: Final[str] = sys.intern("""
       You are a Supervisor Agent for BankX, routing customer requests to specialized domain agents.
 
       ## Your Responsibilities
@@ -139,102 +211,271 @@ class SupervisorAgent :
 
       User: "How can I manage my debt?"
       → Route to AIMoneyCoachAgent
-    """
-    name = "SupervisorAgent"
-    description = "Routes customer requests to specialized domain agents (Account, Transaction, Payment, ProdInfoFAQ, AIMoneyCoach) with context-aware handling"
+    """)
 
-    """ A simple in-memory store [thread_id,serialized Thread state] to keep track of threads per user/session. 
-    In production, this should be replaced with a persistent store like a database or distributed cache.
-    """
-    thread_store: dict[str, dict[str, Any]] = {}
+class SupervisorAgent :
 
-    """ like the thread_store but only with supervisor generated messages. it's used for improve accuracy of agent selection avoiding to innclude messages from sub-agents."""
-    supervisor_thread_store: dict[str, dict[str, Any]] = {}
+    instructions = _INSTRUCTIONS
+    name = "SupervisorAgent"
+    description = "Routes customer requests to specialized domain agents (Account, Transaction, Payment, ProdInfoFAQ, AIMoneyCoach) with context-aware handling"
 
     def __init__(self,
                  azure_chat_client: AzureOpenAIChatClient,
                  account_agent: AccountAgent,
-                 transaction_agent: TransactionHistoryAgent,
+                 transaction_agent: TransactionAgent,
                  payment_agent: PaymentAgent,
                  prodinfo_faq_agent: ProdInfoFAQAgent = None,
-                 ai_money_coach_agent: AIMoneyCoachAgent = None
+                 ai_money_coach_agent: AIMoneyCoachAgent = None,
+                 thread_store: ThreadStore | None = None,
+                 response_cache: ResponseCache | None = None
                                 ):
       self.azure_chat_client = azure_chat_client
+      # Per thread_id the store keeps {"thread": serialized shared thread, "supervisor_thread": serialized supervisor-only thread}.
+      # The supervisor thread holds only supervisor generated messages; it improves accuracy of agent selection by not including sub-agent messages.
+      self.thread_store = thread_store or get_thread_store()
+      self.response_cache = response_cache or get_response_cache()
       self.account_agent = account_agent
       self.transaction_agent = transaction_agent
       self.payment_agent = payment_agent
       self.prodinfo_faq_agent = prodinfo_faq_agent
       self.ai_money_coach_agent = ai_money_coach_agent
 
-
-
-    async def _build_af_agent(self) -> ChatAgent:
-
-      # Build tools list with all available agents
-      tools = [self.route_to_account_agent, self.route_to_transaction_agent, self.route_to_payment_agent]
-
+      # Routing tools never change after __init__, so the list is built once
+      self._tools = [self.route_to_account_agent, self.route_to_transaction_agent, self.route_to_payment_agent]
       if self.prodinfo_faq_agent:
-          tools.append(self.route_to_prodinfo_faq_agent)
-
+          self._tools.append(self.route_to_prodinfo_faq_agent)
       if self.ai_money_coach_agent:
-          tools.append(self.route_to_ai_money_coach_agent)
+          self._tools.append(self.route_to_ai_money_coach_agent)
+
+      # The supervisor ChatAgent is static and built once; sub-agent ChatAgents embed the build time and pooled
+      # MCP tools, so they are cached with a TTL and rebuilt when a tool has been closed
+      self._af_agent: ChatAgent | None = None
+      self._af_sub_agents = AgentCache(maxsize=8, ttl_seconds=_SUB_AGENT_TTL_SECONDS)
+      self._af_agent_lock = asyncio.Lock()
+
+    async def _get_af_agent(self) -> ChatAgent:
+      """Return the supervisor ChatAgent, building it once on first use."""
+      if self._af_agent is None:
+        async with self._af_agent_lock:
+          if self._af_agent is None:
+            self._af_agent = await self._build_af_agent()
+      return self._af_agent
+
+    async def _get_sub_agent(self, key: str, sub_agent) -> ChatAgent:
+      """Return the ChatAgent for a sub-agent, rebuilding it when it expires or holds a closed MCP tool."""
+      af_agent = self._af_sub_agents.get(key)
+      if af_agent is not None:
+        mcp_tools = getattr(af_agent, "_local_mcp_tools", [])
+        if all(tool.is_connected for tool in mcp_tools):
+          # Tell the registry these pooled tools are still in use so idle eviction does not close them
+          registry = get_mcp_tool_registry()
+          for tool in mcp_tools:
+            registry.touch(tool)
+          return af_agent
+        # The registry replaced or closed one of its tools: rebuild to pick up the pooled replacement
+        self._af_sub_agents.invalidate(key)
+      return await self._af_sub_agents.get_or_build(key, sub_agent.build_af_agent)
+
+    async def prewarm(self) -> None:
+      """Build the supervisor and every configured sub-agent ChatAgent ahead of the first request.
+
+      Called from the application lifespan so MCP connections, tool schemas and chat clients are
+      ready before traffic arrives instead of on the first user turns after deploy.
+      """
+      await self._get_af_agent()
+      sub_agents = {
+          "account": self.account_agent,
+          "transaction": self.transaction_agent,
+          "payment": self.payment_agent,
+          "prodinfo_faq": self.prodinfo_faq_agent,
+          "ai_money_coach": self.ai_money_coach_agent,
+      }
+      for key, sub_agent in sub_agents.items():
+        if sub_agent is not None:
+          await self._get_sub_agent(key, sub_agent)
+      logger.info("Supervisor prewarm complete: %d sub-agents built", sum(agent is not None for agent in sub_agents.values()))
+
+    async def _build_af_agent(self) -> ChatAgent:
 
+      # Azure OpenAI caches prompt prefixes automatically. Keep the static routing instructions as the
+      # only system content, byte-identical across turns, so every supervisor call can reuse that prefix.
       return ChatAgent(
             chat_client=self.azure_chat_client,
-            instructions=SupervisorAgent.instructions,
+            instructions=_INSTRUCTIONS,
             name=SupervisorAgent.name,
-            tools=tools
+            tools=self._tools
         )
 
-    async def route_to_account_agent(self, user_message: str) -> str:
-       """ Route the conversation to Account Agent"""
-       af_account_agent = await self.account_agent.build_af_agent()
+    def _record_prompt_cache_usage(self, response) -> None:
+      """Log input/cached prompt token counts reported by the provider for cache hit-rate tracking."""
+      usage = getattr(response, "usage_details", None)
+      if usage is None or not logger.isEnabledFor(logging.INFO):
+        return
+      cache_counts = {
+          key: value
+          for key, value in (getattr(usage, "additional_counts", None) or {}).items()
+          if "cache" in key
+      }
+      logger.info(
+          "Supervisor prompt usage: input_tokens=%s cache=%s",
+          getattr(usage, "input_token_count", None),
+          cache_counts,
+      )
+
+    def _match_fast_route(self, user_message: str):
+      """Return the route_to_* tool for an unambiguous deterministic intent, or None."""
+      name = _fast_route_name(user_message)
+      if name is None:
+        return None
+      if name == "route_to_prodinfo_faq_agent" and not self.prodinfo_faq_agent:
+        return None
+      if name == "route_to_ai_money_coach_agent" and not self.ai_money_coach_agent:
+        return None
+      return getattr(self, name)
+
+    @staticmethod
+    def _is_followup(user_message: str) -> bool:
+      """Cheap check for a short continuation of the previous turn."""
+      return len(user_message.split()) <= _FOLLOWUP_MAX_WORDS and _FOLLOWUP_RE.match(user_message) is not None
+
+    @classmethod
+    def _is_cacheable_question(cls, user_message: str) -> bool:
+      """A standalone question whose answer does not depend on the previous turn."""
+      return len(user_message.split()) >= _CACHE_MIN_WORDS and not cls._is_followup(user_message)
+
+    async def _run_fast_route(self, user_message: str, supervisor_thread, last_route: str | None = None) -> str | None:
+      """Route a deterministic intent or a follow-up directly to its sub-agent, bypassing the supervisor LLM.
+
+      A follow-up of the previous turn goes back to last_route, the sub-agent that answered it.
+      The exchange is appended to the supervisor thread so later LLM routing still sees it.
+      Returns None when the message needs the LLM router.
+      """
+      route = self._match_fast_route(user_message)
+      if route is None and last_route and self._is_followup(user_message):
+        route = getattr(self, f"route_to_{last_route}_agent", None)
+      if route is None:
+        return None
+      logger.debug("Fast route %s for message", route.__name__)
+      response_text = await route(user_message)
+      await supervisor_thread.on_new_messages([
+          ChatMessage(role="user", text=user_message),
+          ChatMessage(role="assistant", text=response_text),
+      ])
+      return response_text
+
+    @staticmethod
+    async def _message_count(thread) -> int | None:
+      """Number of messages held by the thread's local message store, None if it has none."""
+      message_store = getattr(thread, "message_store", None)
+      if message_store is None:
+        return None
+      return len(await message_store.list_messages())
+
+    async def _save_threads(self, thread_id: str, thread, supervisor_thread, stored: dict[str, Any] | None = None,
+                            last_route: str | None = None) -> None:
+      """Persist both serialized threads for thread_id in the thread store.
+
+      A thread whose message count did not change since it was loaded from ``stored`` is not dirty:
+      its previous serialized state is reused instead of re-serializing the whole history.
+      """
+      async def snapshot(key: str, t) -> tuple[Any, int | None]:
+        count = await self._message_count(t)
+        if stored is not None and count is not None and stored.get(f"{key}_messages") == count:
+          return stored[key], count
+        return await t.serialize(), count
+
+      # Both threads are independent: serialize them concurrently and write them as one record
+      (state, count), (supervisor_state, supervisor_count) = await asyncio.gather(
+          snapshot("thread", thread),
+          snapshot("supervisor_thread", supervisor_thread),
+      )
+      await self.thread_store.set(thread_id, {
+          "thread": state,
+          "thread_messages": count,
+          "supervisor_thread": supervisor_state,
+          "supervisor_thread_messages": supervisor_count,
+          "last_route": last_route,
+      })
+
+    async def _answer_from_cache(self, user_message: str, thread_id: str, thread, supervisor_thread,
+                                 stored: dict[str, Any]) -> str | None:
+      """Answer a repeated question of thread_id from the response cache, recording the turn in its history.
+
+      The exchange is appended to both threads and persisted like any other turn, so the conversation
+      history and later LLM routing still see it. Returns None on a cache miss, and for follow-ups and
+      other short messages whose meaning depends on the previous turn.
+      """
+      if not self._is_cacheable_question(user_message):
+        return None
+      cached_response = self.response_cache.lookup(thread_id, user_message)
+      if cached_response is None:
+        return None
+      logger.debug("Response cache hit for thread %s", thread_id)
+      messages = [
+          ChatMessage(role="user", text=user_message),
+          ChatMessage(role="assistant", text=cached_response),
+      ]
+      await asyncio.gather(thread.on_new_messages(messages), supervisor_thread.on_new_messages(messages))
+      await self._save_threads(thread_id, thread, supervisor_thread, stored, stored.get("last_route"))
+      return cached_response
+
+    async def _run_sub_agent(self, key: str, sub_agent) -> str:
+      """Run a sub-agent on the original user message and shared thread of the current request.
+
+      When processMessageStream registered a stream queue, the sub-agent is streamed and its chunks are
+      forwarded to the user as they arrive; the full text is still returned to the supervisor as the tool result.
+      """
+      af_sub_agent = await self._get_sub_agent(key, sub_agent)
 
       #Please note we are using the original user message and not the one generated by the supervisor agent.
-       response = await af_account_agent.run(self.user_message, thread=self.current_thread)
-       return response.text
+      ctx = _REQ_CTX.get()
+      ctx["route"] = key
+      _routing_log.emit({"event": "routing_decision", "route": key, "thread_id": ctx.get("thread_id")})
+      stream_queue: asyncio.Queue | None = ctx.get("stream_queue")
+      async with _AZURE_SEM:
+        if stream_queue is None:
+          response = await af_sub_agent.run(ctx["user_message"], thread=ctx["thread"])
+          return response.text
+
+        parts: list[str] = []
+        async for update in af_sub_agent.run_stream(ctx["user_message"], thread=ctx["thread"]):
+          if update.text:
+            parts.append(update.text)
+            stream_queue.put_nowait((True, update.text))
+        return "".join(parts)
+
+    async def route_to_account_agent(self, user_message: str) -> str:
+       """ Route the conversation to Account Agent"""
+       return await self._run_sub_agent("account", self.account_agent)
     
     async def route_to_transaction_agent(self, user_message: str) -> str:
        """ Route the conversation to Transaction History Agent"""
-       af_transaction_agent = await self.transaction_agent.build_af_agent()
-      
-      #Please note we are using the original user message and not the one generated by the supervisor agent.
-       response = await af_transaction_agent.run(self.user_message, thread=self.current_thread)
-       return response.text
+       return await self._run_sub_agent("transaction", self.transaction_agent)
     
     async def route_to_payment_agent(self, user_message: str) -> str:
        """ Route the conversation to Payment Agent"""
-       af_payment_agent = await self.payment_agent.build_af_agent()
-
-      #Please note we are using the original user message and not the one generated by the supervisor agent.
-       response = await af_payment_agent.run(self.user_message, thread=self.current_thread)
-       return response.text
+       return await self._run_sub_agent("payment", self.payment_agent)
 
     async def route_to_prodinfo_faq_agent(self, user_message: str) -> str:
        """ Route the conversation to ProdInfoFAQ Agent for product information and FAQs (UC2)"""
        if not self.prodinfo_faq_agent:
            return "Product information service is currently unavailable. Please contact customer service."
 
-       af_prodinfo_faq_agent = await self.prodinfo_faq_agent.build_af_agent()
-
-      #Please note we are using the original user message and not the one generated by the supervisor agent.
-       response = await af_prodinfo_faq_agent.run(self.user_message, thread=self.current_thread)
-       return response.text
+       return await self._run_sub_agent("prodinfo_faq", self.prodinfo_faq_agent)
 
     async def route_to_ai_money_coach_agent(self, user_message: str) -> str:
        """ Route the conversation to AIMoneyCoach Agent for personal finance coaching (UC3)"""
        if not self.ai_money_coach_agent:
            return "AI Money Coach service is currently unavailable. Please contact customer service."
 
-       af_ai_money_coach_agent = await self.ai_money_coach_agent.build_af_agent()
-
-      #Please note we are using the original user message and not the one generated by the supervisor agent.
-       response = await af_ai_money_coach_agent.run(self.user_message, thread=self.current_thread)
-       return response.text
+       return await self._run_sub_agent("ai_money_coach", self.ai_money_coach_agent)
 
     async def processMessageStream(self, user_message: str , thread_id : str | None) -> AsyncGenerator[tuple[str, bool, str | None], None]:
       """Process a chat message and stream the response.
 
+      Sub-agent output is streamed straight through to the caller. Once a sub-agent has streamed,
+      the supervisor's own text (which only echoes the sub-agent answer) is not forwarded again.
+
       Yields:
           tuple[str, bool, str | None]: (content_chunk, is_final, thread_id)
               - content_chunk: The text chunk to send
@@ -243,52 +484,88 @@ class SupervisorAgent :
       """
       try:
           # Set up agent and thread (same as processMessage)
-          agent = await self._build_af_agent()
+          agent = await self._get_af_agent()
 
           processed_thread_id = thread_id
           supervisor_resumed_thread = agent.get_new_thread()
 
           # Handle thread creation or resumption
           if processed_thread_id is None:
-              self.current_thread = agent.get_new_thread()
+              current_thread = agent.get_new_thread()
               processed_thread_id = str(uuid4())
-              SupervisorAgent.thread_store[processed_thread_id] = await self.current_thread.serialize()
-              SupervisorAgent.supervisor_thread_store[processed_thread_id] = await supervisor_resumed_thread.serialize()
+              stored = None
           else:
-              serialized_thread = SupervisorAgent.thread_store.get(processed_thread_id, None)
-              supervisor_serialized_thread = SupervisorAgent.supervisor_thread_store.get(processed_thread_id, None)
+              stored = await self.thread_store.get(processed_thread_id)
               
-              if serialized_thread is None or supervisor_serialized_thread is None:
-                  raise AgentThreadException(f"Thread id {processed_thread_id} not found in thread stores")
+              if stored is None:
+                  raise AgentThreadException(f"Thread id {processed_thread_id} not found in thread store")
               
-              resumed_thread = agent.get_new_thread()
-              await resumed_thread.update_from_thread_state(serialized_thread)
-              self.current_thread = resumed_thread
-              await supervisor_resumed_thread.update_from_thread_state(supervisor_serialized_thread)
-
-          # Save the original user message
-          self.user_message = user_message
-
-          # Stream the response
-          full_response = ""
+              current_thread = agent.get_new_thread()
+              await asyncio.gather(
+                  current_thread.update_from_thread_state(stored["thread"]),
+                  supervisor_resumed_thread.update_from_thread_state(stored["supervisor_thread"]),
+              )
+
+              cached_response = await self._answer_from_cache(
+                  user_message, processed_thread_id, current_thread, supervisor_resumed_thread, stored
+              )
+              if cached_response is not None:
+                  yield (cached_response, False, None)
+                  yield ("", True, processed_thread_id)
+                  return
+
+          # Chunks to forward to the caller: (from_sub_agent, text), terminated by None
+          stream_queue: asyncio.Queue = asyncio.Queue()
+
+          # Save the original user message and thread for the sub-agent tools of this request
+          ctx = {"user_message": user_message, "thread": current_thread, "thread_id": processed_thread_id, "stream_queue": stream_queue}
+          last_route = stored.get("last_route") if stored else None
+
+          async def produce() -> None:
+              # Set inside the producer task, which runs the sub-agent tools, so the caller's context is never touched
+              ctx_token = _REQ_CTX.set(ctx)
+              try:
+                  fast_response = await self._run_fast_route(user_message, supervisor_resumed_thread, last_route)
+                  if fast_response is None:
+                      async for chunk in agent.run_stream(user_message, thread=supervisor_resumed_thread):
+                          if hasattr(chunk, 'text') and chunk.text:
+                              stream_queue.put_nowait((False, chunk.text))
+              finally:
+                  _REQ_CTX.reset(ctx_token)
+                  stream_queue.put_nowait(None)
+
+          producer = asyncio.create_task(produce())
 
           try:
-              # Use streaming
-              async for chunk in agent.run_stream(user_message, thread=supervisor_resumed_thread):
-                  if hasattr(chunk, 'text') and chunk.text:
-                      content = chunk.text
-                      full_response += content
-                      # Yield intermediate chunk
-                      yield (content, False, None)
+              sub_agent_streamed = False
+              response_parts: list[str] = []
+              while (item := await stream_queue.get()) is not None:
+                  from_sub_agent, content = item
+                  if from_sub_agent:
+                      sub_agent_streamed = True
+                  elif sub_agent_streamed:
+                      continue
+                  response_parts.append(content)
+                  # Yield intermediate chunk
+                  yield (content, False, None)
+              await producer
           except Exception as stream_error:
               logger.error(f"Error during streaming: {str(stream_error)}", exc_info=True)
               error_message = f"Streaming failed: {str(stream_error)}. Please try again or disable streaming."
+              if stored is None:
+                  # New threads are only persisted after the run; store it so the returned thread id can be resumed
+                  await self._save_threads(processed_thread_id, current_thread, supervisor_resumed_thread)
               yield (error_message, True, processed_thread_id)
               return
+          finally:
+              if not producer.done():
+                  producer.cancel()
 
-          # Update thread stores
-          SupervisorAgent.thread_store[processed_thread_id] = await self.current_thread.serialize()
-          SupervisorAgent.supervisor_thread_store[processed_thread_id] = await supervisor_resumed_thread.serialize()
+          # Update thread store
+          await self._save_threads(processed_thread_id, current_thread, supervisor_resumed_thread, stored, ctx.get("route"))
+
+          if ctx.get("route") in _CACHEABLE_ROUTES and self._is_cacheable_question(user_message):
+              self.response_cache.put(processed_thread_id, user_message, "".join(response_parts))
 
           # Yield final chunk with thread_id
           yield ("", True, processed_thread_id)
@@ -302,47 +579,71 @@ class SupervisorAgent :
     async def processMessage(self, user_message: str , thread_id : str | None) -> tuple[str, str | None]:
       """Process a chat message using the injected Azure Chat Completion service and return response and thread id."""
       #For azure chat based agents we need to provide the message history externally as there is no built-in memory thread implementation per thread id.
-      
-      agent = await self._build_af_agent()
+
+      agent = await self._get_af_agent()
 
       processed_thread_id = thread_id
       supervisor_resumed_thread =  agent.get_new_thread()
       # The AgentThread doesn't allow to provide an external id when using azure openai chat completion agent. so we need to manage the thread id externally.
       if processed_thread_id is None:
-         self.current_thread = agent.get_new_thread()
+         current_thread = agent.get_new_thread()
          processed_thread_id = str(uuid4())
-         SupervisorAgent.thread_store[processed_thread_id] = await  self.current_thread.serialize()
-         SupervisorAgent.supervisor_thread_store[processed_thread_id] = await supervisor_resumed_thread.serialize()
+         stored = None
+         # Nothing to persist yet: both threads are stored once, after the run below
 
       else :
-        serialized_thread = SupervisorAgent.thread_store.get(processed_thread_id, None)
-        supervisor_serialized_thread = SupervisorAgent.supervisor_thread_store.get(processed_thread_id, None)
-        
-        if serialized_thread is None or supervisor_serialized_thread is None:
-           raise AgentThreadException(f"Thread id {processed_thread_id} not found in thread stores")
-        # set the thread as class instance variable so that it can be shared by agents called in the tools
+        stored = await self.thread_store.get(processed_thread_id)
         
+        if stored is None:
+           raise AgentThreadException(f"Thread id {processed_thread_id} not found in thread store")
         # there is bug in agent framework. I'll use update_from_thread_state as workaround
-        # self.current_thread = await agent.deserialize_thread(serialized_thread)
-        resumed_thread =  agent.get_new_thread()
-        
-        await resumed_thread.update_from_thread_state(serialized_thread)
-        self.current_thread = resumed_thread
+        # current_thread = await agent.deserialize_thread(serialized_thread)
+        current_thread = agent.get_new_thread()
+        await asyncio.gather(
+            current_thread.update_from_thread_state(stored["thread"]),
+            supervisor_resumed_thread.update_from_thread_state(stored["supervisor_thread"]),
+        )
 
-        
-        await supervisor_resumed_thread.update_from_thread_state(supervisor_serialized_thread)
+        cached_response = await self._answer_from_cache(
+            user_message, processed_thread_id, current_thread, supervisor_resumed_thread, stored
+        )
+        if cached_response is not None:
+          return cached_response, processed_thread_id
 
       #save the original user message to that can be used by sub-agents. we don't want to use the generated message from supervisor agent as input for sub-agents.
       # this is a hack when implementing supervisor pattern using agent-as-tool implementation. Once hand-off pattern will be available in agent framework it won't be required
       #as the context will be handed-off to the sub-agent who will take the control of the conversation and directly respond to the user.
-      self.user_message = user_message
-
-      response = await agent.run(user_message, thread=supervisor_resumed_thread)
+      ctx = {"user_message": user_message, "thread": current_thread, "thread_id": processed_thread_id}
+      ctx_token = _REQ_CTX.set(ctx)
+      try:
+        last_route = stored.get("last_route") if stored else None
+        response_text = await self._run_fast_route(user_message, supervisor_resumed_thread, last_route)
+        if response_text is None:
+          response = await agent.run(user_message, thread=supervisor_resumed_thread)
+          self._record_prompt_cache_usage(response)
+          response_text = response.text
+      finally:
+        _REQ_CTX.reset(ctx_token)
 
       #make sure to update the thread store with the latest thread state
-      SupervisorAgent.thread_store[processed_thread_id] = await self.current_thread.serialize()
-      SupervisorAgent.supervisor_thread_store[processed_thread_id] = await supervisor_resumed_thread.serialize()
+      await self._save_threads(processed_thread_id, current_thread, supervisor_resumed_thread, stored, ctx.get("route"))
+
+      if ctx.get("route") in _CACHEABLE_ROUTES and self._is_cacheable_question(user_message):
+        self.response_cache.put(processed_thread_id, user_message, response_text)
       
-      return response.text, processed_thread_id
+      return response_text, processed_thread_id
+
+    
+    async def processBatch(self, items: list[tuple[str, str | None]], max_concurrency: int = 8) -> list[tuple[str, str | None]]:
+      """Process several (user_message, thread_id) pairs concurrently and return their (response, thread_id) in order.
+
+      At most max_concurrency messages are in flight at once. Items must not share a thread id,
+      as turns of the same conversation have to run one after another.
+      """
+      semaphore = asyncio.Semaphore(max_concurrency)
+
+      async def process(user_message: str, thread_id: str | None) -> tuple[str, str | None]:
+        async with semaphore:
+          return await self.processMessage(user_message, thread_id)
 
-    
\ No newline at end of file
+      return list(await asyncio.gather(*(process(user_message, thread_id) for user_message, thread_id in items)))
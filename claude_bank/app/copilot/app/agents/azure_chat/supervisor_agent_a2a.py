@@ -4,25 +4,79 @@ Refactored Supervisor Agent with A2A Communication.
 This version uses the A2A SDK to communicate with domain agent microservices
 instead of direct Python method calls.
 """
-from typing import Any, AsyncGenerator
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Awaitable, Callable, NamedTuple
 from agent_framework import ChatAgent
 from agent_framework.exceptions import AgentThreadException
 from agent_framework.azure import AzureOpenAIChatClient
 from uuid import uuid4
+import asyncio
+import json
 import logging
-import sys
 import os
 
-# Add paths for A2A SDK
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../"))
-
 from a2a_sdk.client.a2a_client import A2AClient
 from a2a_sdk.client.registry_client import RegistryClient
-from a2a_sdk.models.message import A2AMessage
+from a2a_sdk.client.caching_registry_client import CachingRegistryClient
+from a2a_sdk.utils.circuit_breaker import CircuitBreakerError
 from common.observability import get_logger, create_span, add_span_attributes
+from app.cache.thread_store import ThreadStore, get_thread_store
 
 logger = get_logger(__name__)
 
+# Default max in-flight A2A calls per downstream capability
+DEFAULT_BULKHEAD_LIMIT = 16
+
+# Max conversations whose live threads are kept in memory
+MAX_LIVE_THREADS = 10_000
+
+# In-flight background thread persistence tasks
+_persist_tasks: set[asyncio.Task] = set()
+
+
+def _default_payload(supervisor: "SupervisorAgentA2A") -> dict:
+    return {
+        "customer_id": supervisor.customer_id,
+        "user_message": supervisor.user_message,
+        "requester_role": supervisor.requester_role,
+    }
+
+
+def _query_payload(supervisor: "SupervisorAgentA2A") -> dict:
+    return {
+        "customer_id": supervisor.customer_id,
+        "query": supervisor.user_message,
+    }
+
+
+def _context_payload(supervisor: "SupervisorAgentA2A") -> dict:
+    return {
+        "customer_id": supervisor.customer_id,
+        "context": {"user_message": supervisor.user_message},
+    }
+
+
+class Route(NamedTuple):
+    """A routing tool exposed to the supervisor LLM and the A2A capability it invokes."""
+
+    name: str  # Tool is exposed as route_to_<name>_agent
+    capability: str  # A2A capability, also used as the intent
+    target_agent: str
+    display_name: str
+    service: str  # Used in fallback messages
+    build_payload: Callable[["SupervisorAgentA2A"], dict]
+
+
+ROUTES: tuple[Route, ...] = (
+    Route("account", "account.balance", "AccountAgent", "Account Agent", "account service", _default_payload),
+    Route("transaction", "transaction.history", "TransactionAgent", "Transaction Agent", "transaction service", _default_payload),
+    Route("payment", "payment.transfer", "PaymentAgent", "Payment Agent", "payment service", _default_payload),
+    Route("prodinfo_faq", "product.info", "ProdInfoFAQAgent", "ProdInfoFAQ Agent", "product information service", _query_payload),
+    Route("ai_money_coach", "coaching.debt_management", "AIMoneyCoachAgent", "AIMoneyCoach Agent", "AI Money Coach service", _context_payload),
+)
+_ROUTES_BY_NAME: dict[str, Route] = {route.name: route for route in ROUTES}
+_ROUTES_BY_CAPABILITY: dict[str, Route] = {route.capability: route for route in ROUTES}
+
 
 class SupervisorAgentA2A:
     """
@@ -85,7 +139,9 @@ class SupervisorAgentA2A:
       - "Should I consolidate my loans?"
 
       ## Important Notes
-      1. **Single routing per request** - Route to ONE agent only
+      1. **Single routing per request** - Route to ONE agent only; when a message clearly asks for
+         several independent things (e.g. "balance and last week's transactions"), call route_many
+         once with every agent needed instead of calling the route tools one after another
       2. **Pass complete context** - Include full user message
       3. **Return agent response as-is** - Don't modify structured outputs
       4. **Log routing decisions** - For governance and analytics
@@ -95,15 +151,14 @@ class SupervisorAgentA2A:
     name = "SupervisorAgent"
     description = "Routes customer requests to specialized domain agents via A2A communication"
 
-    thread_store: dict[str, dict[str, Any]] = {}
-    supervisor_thread_store: dict[str, dict[str, Any]] = {}
-
     def __init__(
         self,
         azure_chat_client: AzureOpenAIChatClient,
         agent_registry_url: str = None,
         customer_id: str = None,
         requester_role: str = "customer",
+        bulkhead_limits: dict[str, int] | None = None,
+        thread_store: ThreadStore | None = None,
     ):
         """
         Initialize Supervisor Agent with A2A client.
@@ -113,281 +168,285 @@ class SupervisorAgentA2A:
             agent_registry_url: URL of the agent registry service
             customer_id: Customer ID for context
             requester_role: Role of the requester (customer or teller)
+            bulkhead_limits: Max in-flight A2A calls per capability (default 16 each)
+            thread_store: Serialized thread storage (bounded in-memory LRU, or Redis when configured)
         """
         self.azure_chat_client = azure_chat_client
         self.customer_id = customer_id
         self.requester_role = requester_role
+        self.thread_store = thread_store or get_thread_store()
+        # Live (thread, supervisor thread) per thread_id, least recently used first. Threads are updated in
+        # place by agent runs, so a turn resumes them without an update_from_thread_state() round-trip;
+        # the thread store holds the serialized copy for restarts and other replicas.
+        # Per instance, so supervisors built for different customers never share conversation threads.
+        self._live_threads: OrderedDict[str, tuple[Any, Any]] = OrderedDict()
 
         # Initialize A2A client
         registry_url = agent_registry_url or os.getenv(
             "AGENT_REGISTRY_URL", "http://localhost:9000"
         )
-        self.registry_client = RegistryClient(registry_url)
+        # Capability -> endpoint lookups are cached so routing does not hit the registry on every call
+        self.registry_client = CachingRegistryClient(
+            RegistryClient(registry_url),
+            prewarm_capabilities=list(_ROUTES_BY_CAPABILITY),
+        )
         self.a2a_client = A2AClient(
             agent_id="supervisor-001",
             agent_name="SupervisorAgent",
             registry_client=self.registry_client,
         )
 
+        # Bulkheads: one semaphore per capability so a hung agent cannot take every in-flight slot
+        limits = bulkhead_limits or {}
+        self._bulkhead_limits = {
+            capability: limits.get(capability, DEFAULT_BULKHEAD_LIMIT) for capability in _ROUTES_BY_CAPABILITY
+        }
+        self._bulkheads: dict[str, asyncio.Semaphore] = {
+            capability: asyncio.Semaphore(limit) for capability, limit in self._bulkhead_limits.items()
+        }
+
+        # Routing tools never change after __init__: bind them once as an immutable tuple
+        self._tools = tuple(self._make_route_tool(route) for route in ROUTES) + (self.route_many,)
+
+        # Built ChatAgent is reused across requests; rebuilt only if the chat client is swapped
+        self._agent: ChatAgent | None = None
+        self._agent_client: AzureOpenAIChatClient | None = None
+        self._agent_lock = asyncio.Lock()
+
         logger.info(
             f"Supervisor Agent initialized with A2A client (registry: {registry_url})"
         )
 
+    async def _get_af_agent(self) -> ChatAgent:
+        """Return the cached Agent Framework agent, building it on first use."""
+        if self._agent is None or self._agent_client is not self.azure_chat_client:
+            async with self._agent_lock:
+                if self._agent is None or self._agent_client is not self.azure_chat_client:
+                    self._agent = await self._build_af_agent()
+                    self._agent_client = self.azure_chat_client
+        return self._agent
+
+    async def prewarm(self) -> None:
+        """Build the routing agent and resolve every route's registry entry ahead of the first request."""
+        await self._get_af_agent()
+        await self.registry_client.prewarm()
+
     async def _build_af_agent(self) -> ChatAgent:
         """Build the Agent Framework agent with routing tools."""
-        tools = [
-            self.route_to_account_agent,
-            self.route_to_transaction_agent,
-            self.route_to_payment_agent,
-            self.route_to_prodinfo_faq_agent,
-            self.route_to_ai_money_coach_agent,
-        ]
-
         return ChatAgent(
             chat_client=self.azure_chat_client,
             instructions=SupervisorAgentA2A.instructions,
             name=SupervisorAgentA2A.name,
-            tools=tools,
+            # ChatAgent normalizes non-list tools as a single tool; the build runs once, so the copy is free
+            tools=list(self._tools),
         )
 
-    async def route_to_account_agent(self, user_message: str) -> str:
-        """Route the conversation to Account Agent via A2A."""
-        with create_span(
-            "supervisor_route",
-            {"target_agent": "AccountAgent", "intent": "account.balance"},
-        ):
-            try:
-                # Create A2A message
-                a2a_message = A2AMessage(
-                    intent="account.balance",
-                    payload={
-                        "customer_id": self.customer_id,
-                        "user_message": self.user_message,
-                        "requester_role": self.requester_role,
-                    },
-                )
-
-                # Send via A2A
-                response = await self.a2a_client.send_message(
-                    target_capability="account.balance",
-                    intent="account.balance",
-                    payload=a2a_message.payload,
-                )
-
-                # Extract response
-                if response.status == "success":
-                    return self._format_agent_response(response.response)
-                else:
-                    return f"Error from Account Agent: {response.response.get('error', 'Unknown error')}"
+    def _route_request(self, agent: str) -> tuple[str, str, dict]:
+        """
+        Build the (intent, capability, payload) triple for a routing target.
 
-            except Exception as e:
-                logger.error(f"Failed to route to Account Agent: {e}", exc_info=True)
-                return f"I apologize, but I'm having trouble connecting to the account service. Please try again."
+        Args:
+            agent: Route name, one of account, transaction, payment, prodinfo_faq, ai_money_coach
 
-    async def route_to_transaction_agent(self, user_message: str) -> str:
-        """Route the conversation to Transaction Agent via A2A."""
+        Returns:
+            Intent, target capability and A2A payload for the original user message
+        """
+        route = _ROUTES_BY_NAME[agent]
+        return route.capability, route.capability, route.build_payload(self)
+
+    def _make_route_tool(self, route: Route) -> Callable[[str], Awaitable[str]]:
+        """Build the route_to_<name>_agent tool; name and docstring are what the LLM sees."""
+        async def route_tool(user_message: str) -> str:
+            return await self._dispatch(*self._route_request(route.name))
+
+        route_tool.__name__ = route_tool.__qualname__ = f"route_to_{route.name}_agent"
+        route_tool.__doc__ = f"Route the conversation to {route.display_name} via A2A."
+        return route_tool
+
+    async def _dispatch(self, intent: str, capability: str, payload: dict) -> str:
+        """Send one A2A request and format the reply, in its own span so per-agent latency stays attributable."""
+        route = _ROUTES_BY_CAPABILITY[capability]
+        target_agent, display_name, service = route.target_agent, route.display_name, route.service
         with create_span(
             "supervisor_route",
-            {"target_agent": "TransactionAgent", "intent": "transaction.history"},
+            {"target_agent": target_agent, "intent": intent},
         ):
             try:
-                a2a_message = A2AMessage(
-                    intent="transaction.history",
-                    payload={
-                        "customer_id": self.customer_id,
-                        "user_message": self.user_message,
-                        "requester_role": self.requester_role,
-                    },
-                )
-
-                response = await self.a2a_client.send_message(
-                    target_capability="transaction.history",
-                    intent="transaction.history",
-                    payload=a2a_message.payload,
-                )
+                bulkhead = self._bulkheads[capability]
+                add_span_attributes(**{
+                    "bulkhead.limit": self._bulkhead_limits[capability],
+                    "bulkhead.saturated": bulkhead.locked(),
+                })
+                async with bulkhead:
+                    response = await self.a2a_client.send_message(
+                        target_capability=capability,
+                        intent=intent,
+                        payload=payload,
+                    )
 
                 if response.status == "success":
                     return self._format_agent_response(response.response)
                 else:
-                    return f"Error from Transaction Agent: {response.response.get('error', 'Unknown error')}"
+                    return f"Error from {display_name}: {response.response.get('error', 'Unknown error')}"
 
-            except Exception as e:
-                logger.error(f"Failed to route to Transaction Agent: {e}", exc_info=True)
-                return f"I apologize, but I'm having trouble connecting to the transaction service. Please try again."
-
-    async def route_to_payment_agent(self, user_message: str) -> str:
-        """Route the conversation to Payment Agent via A2A."""
-        with create_span(
-            "supervisor_route",
-            {"target_agent": "PaymentAgent", "intent": "payment.transfer"},
-        ):
-            try:
-                a2a_message = A2AMessage(
-                    intent="payment.transfer",
-                    payload={
-                        "customer_id": self.customer_id,
-                        "user_message": self.user_message,
-                        "requester_role": self.requester_role,
-                    },
-                )
-
-                response = await self.a2a_client.send_message(
-                    target_capability="payment.transfer",
-                    intent="payment.transfer",
-                    payload=a2a_message.payload,
-                )
-
-                if response.status == "success":
-                    return self._format_agent_response(response.response)
-                else:
-                    return f"Error from Payment Agent: {response.response.get('error', 'Unknown error')}"
+            except CircuitBreakerError as e:
+                # Agent is known to be down: answer right away instead of waiting on its timeout
+                add_span_attributes(**{"breaker.state": "open"})
+                logger.warning(f"Not routing to {display_name}: {e}")
+                return f"I apologize, but the {service} is temporarily unavailable. Please try again shortly."
 
             except Exception as e:
-                logger.error(f"Failed to route to Payment Agent: {e}", exc_info=True)
-                return f"I apologize, but I'm having trouble connecting to the payment service. Please try again."
-
-    async def route_to_prodinfo_faq_agent(self, user_message: str) -> str:
-        """Route the conversation to ProdInfoFAQ Agent via A2A."""
-        with create_span(
-            "supervisor_route",
-            {"target_agent": "ProdInfoFAQAgent", "intent": "product.info"},
-        ):
-            try:
-                a2a_message = A2AMessage(
-                    intent="product.info",
-                    payload={
-                        "customer_id": self.customer_id,
-                        "query": self.user_message,
-                    },
-                )
+                logger.error(f"Failed to route to {display_name}: {e}", exc_info=True)
+                # The cached endpoint may be stale; resolve it again on the next call
+                self.registry_client.invalidate(capability)
+                return f"I apologize, but I'm having trouble connecting to the {service}. Please try again."
 
-                response = await self.a2a_client.send_message(
-                    target_capability="product.info",
-                    intent="product.info",
-                    payload=a2a_message.payload,
-                )
-
-                if response.status == "success":
-                    return self._format_agent_response(response.response)
-                else:
-                    return f"Error from ProdInfoFAQ Agent: {response.response.get('error', 'Unknown error')}"
+    async def route_many(self, agents: list[str]) -> str:
+        """
+        Route a multi-intent request to several agents at once via A2A.
 
-            except Exception as e:
-                logger.error(f"Failed to route to ProdInfoFAQ Agent: {e}", exc_info=True)
-                return f"I apologize, but I'm having trouble connecting to the product information service. Please try again."
+        Args:
+            agents: Agents to call, any of account, transaction, payment, prodinfo_faq, ai_money_coach
 
-    async def route_to_ai_money_coach_agent(self, user_message: str) -> str:
-        """Route the conversation to AIMoneyCoach Agent via A2A."""
-        with create_span(
-            "supervisor_route",
-            {"target_agent": "AIMoneyCoachAgent", "intent": "coaching.debt_management"},
-        ):
+        Returns:
+            Each agent's response, labelled by agent
+        """
+        triples = []
+        for agent in agents:
             try:
-                a2a_message = A2AMessage(
-                    intent="coaching.debt_management",
-                    payload={
-                        "customer_id": self.customer_id,
-                        "context": {"user_message": self.user_message},
-                    },
-                )
-
-                response = await self.a2a_client.send_message(
-                    target_capability="coaching.debt_management",
-                    intent="coaching.debt_management",
-                    payload=a2a_message.payload,
-                )
-
-                if response.status == "success":
-                    return self._format_agent_response(response.response)
-                else:
-                    return f"Error from AIMoneyCoach Agent: {response.response.get('error', 'Unknown error')}"
+                triples.append((agent, self._route_request(agent)))
+            except KeyError:
+                logger.warning(f"route_many called with unknown agent: {agent}")
+
+        # Independent A2A calls: total latency is the slowest hop instead of the sum of all hops
+        results = await asyncio.gather(
+            *[self._dispatch(*triple) for _, triple in triples],
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.error(f"Failed to route to AIMoneyCoach Agent: {e}", exc_info=True)
-                return f"I apologize, but I'm having trouble connecting to the AI Money Coach service. Please try again."
+        return "\n\n".join(
+            f"[{agent}]\n{result}" for (agent, _), result in zip(triples, results)
+        )
 
-    def _format_agent_response(self, response_payload: dict) -> str:
+    def _format_agent_response(self, response_payload: dict, pretty: bool = False) -> str:
         """
         Format agent response payload into text.
 
         Args:
             response_payload: Response payload from agent
+            pretty: Indent the JSON for human display; the routing path sends it compact
 
         Returns:
             Formatted text response
         """
         # For now, return JSON string representation
         # In production, format based on response type (BALANCE_CARD, TXN_TABLE, etc.)
-        import json
-        return json.dumps(response_payload, indent=2)
+        if pretty:
+            return json.dumps(response_payload, indent=2, default=str)
+        # Compact separators: less to encode and fewer prompt tokens when the supervisor reads the tool result
+        return json.dumps(response_payload, separators=(",", ":"), default=str)
+
+    def _remember_threads(self, thread_id: str, thread: Any, supervisor_thread: Any) -> None:
+        """Keep the live threads of a conversation, evicting the least recently used beyond MAX_LIVE_THREADS."""
+        live_threads = self._live_threads
+        live_threads[thread_id] = (thread, supervisor_thread)
+        live_threads.move_to_end(thread_id)
+        while len(live_threads) > MAX_LIVE_THREADS:
+            live_threads.popitem(last=False)
+
+    async def _load_threads(self, agent: ChatAgent, thread_id: str) -> tuple[Any, Any]:
+        """Return the live (thread, supervisor thread) of a conversation, restoring them from the thread store on a miss."""
+        live = self._live_threads.get(thread_id)
+        if live is not None:
+            return live
+
+        stored = await self.thread_store.get(thread_id)
+        if stored is None:
+            raise AgentThreadException(
+                f"Thread id {thread_id} not found in thread stores"
+            )
+
+        thread = agent.get_new_thread()
+        supervisor_thread = agent.get_new_thread()
+        await asyncio.gather(
+            thread.update_from_thread_state(stored["thread"]),
+            supervisor_thread.update_from_thread_state(stored["supervisor_thread"]),
+        )
+        return thread, supervisor_thread
+
+    async def _persist_threads(self, thread_id: str, thread: Any, supervisor_thread: Any) -> None:
+        """Write the serialized threads of a conversation to the thread store; errors are logged, not raised."""
+        try:
+            state, supervisor_state = await asyncio.gather(
+                thread.serialize(), supervisor_thread.serialize()
+            )
+            await self.thread_store.set(
+                thread_id, {"thread": state, "supervisor_thread": supervisor_state}
+            )
+        except Exception as e:
+            logger.error(f"Failed to persist thread {thread_id}: {e}", exc_info=True)
+
+    def _persist_threads_in_background(self, thread_id: str, thread: Any, supervisor_thread: Any) -> None:
+        """Persist off the response path; this replica keeps serving the live threads meanwhile."""
+        task = asyncio.create_task(
+            self._persist_threads(thread_id, thread, supervisor_thread)
+        )
+        # Hold a reference until done so the task is not garbage collected mid-write
+        _persist_tasks.add(task)
+        task.add_done_callback(_persist_tasks.discard)
+
+    async def _save_threads(self, thread_id: str, thread: Any, supervisor_thread: Any, is_new: bool) -> None:
+        """Mark the threads most recently used and persist them.
+
+        The first write of a new thread is awaited so the returned thread id resolves on any replica;
+        later updates are persisted in the background while this replica serves the live threads.
+        """
+        self._remember_threads(thread_id, thread, supervisor_thread)
+        if is_new:
+            await self._persist_threads(thread_id, thread, supervisor_thread)
+        else:
+            self._persist_threads_in_background(thread_id, thread, supervisor_thread)
 
     async def processMessageStream(
         self, user_message: str, thread_id: str | None
     ) -> AsyncGenerator[tuple[str, bool, str | None], None]:
         """Process a chat message and stream the response."""
         try:
-            agent = await self._build_af_agent()
+            agent = await self._get_af_agent()
 
             processed_thread_id = thread_id
-            supervisor_resumed_thread = agent.get_new_thread()
 
             if processed_thread_id is None:
                 self.current_thread = agent.get_new_thread()
+                supervisor_resumed_thread = agent.get_new_thread()
                 processed_thread_id = str(uuid4())
-                SupervisorAgentA2A.thread_store[processed_thread_id] = (
-                    await self.current_thread.serialize()
-                )
-                SupervisorAgentA2A.supervisor_thread_store[processed_thread_id] = (
-                    await supervisor_resumed_thread.serialize()
-                )
             else:
-                serialized_thread = SupervisorAgentA2A.thread_store.get(
-                    processed_thread_id, None
-                )
-                supervisor_serialized_thread = (
-                    SupervisorAgentA2A.supervisor_thread_store.get(
-                        processed_thread_id, None
-                    )
-                )
-
-                if serialized_thread is None or supervisor_serialized_thread is None:
-                    raise AgentThreadException(
-                        f"Thread id {processed_thread_id} not found in thread stores"
-                    )
-
-                resumed_thread = agent.get_new_thread()
-                await resumed_thread.update_from_thread_state(serialized_thread)
-                self.current_thread = resumed_thread
-                await supervisor_resumed_thread.update_from_thread_state(
-                    supervisor_serialized_thread
+                self.current_thread, supervisor_resumed_thread = await self._load_threads(
+                    agent, processed_thread_id
                 )
+            self._remember_threads(
+                processed_thread_id, self.current_thread, supervisor_resumed_thread
+            )
 
             # Save the original user message
             self.user_message = user_message
 
             # Stream the response
-            full_response = ""
-
             try:
                 async for chunk in agent.run_stream(
                     user_message, thread=supervisor_resumed_thread
                 ):
                     if hasattr(chunk, "text") and chunk.text:
-                        content = chunk.text
-                        full_response += content
-                        yield (content, False, None)
+                        yield (chunk.text, False, None)
             except Exception as stream_error:
                 logger.error(f"Error during streaming: {str(stream_error)}", exc_info=True)
                 error_message = f"Streaming failed: {str(stream_error)}. Please try again."
                 yield (error_message, True, processed_thread_id)
                 return
 
-            # Update thread stores
-            SupervisorAgentA2A.thread_store[processed_thread_id] = (
-                await self.current_thread.serialize()
-            )
-            SupervisorAgentA2A.supervisor_thread_store[processed_thread_id] = (
-                await supervisor_resumed_thread.serialize()
+            # Threads were updated in place
+            await self._save_threads(
+                processed_thread_id, self.current_thread, supervisor_resumed_thread, thread_id is None
             )
 
             yield ("", True, processed_thread_id)
@@ -401,53 +460,30 @@ class SupervisorAgentA2A:
         self, user_message: str, thread_id: str | None
     ) -> tuple[str, str | None]:
         """Process a chat message and return response and thread id."""
-        agent = await self._build_af_agent()
+        agent = await self._get_af_agent()
 
         processed_thread_id = thread_id
-        supervisor_resumed_thread = agent.get_new_thread()
 
         if processed_thread_id is None:
             self.current_thread = agent.get_new_thread()
+            supervisor_resumed_thread = agent.get_new_thread()
             processed_thread_id = str(uuid4())
-            SupervisorAgentA2A.thread_store[processed_thread_id] = (
-                await self.current_thread.serialize()
-            )
-            SupervisorAgentA2A.supervisor_thread_store[processed_thread_id] = (
-                await supervisor_resumed_thread.serialize()
-            )
-
         else:
-            serialized_thread = SupervisorAgentA2A.thread_store.get(
-                processed_thread_id, None
-            )
-            supervisor_serialized_thread = SupervisorAgentA2A.supervisor_thread_store.get(
-                processed_thread_id, None
-            )
-
-            if serialized_thread is None or supervisor_serialized_thread is None:
-                raise AgentThreadException(
-                    f"Thread id {processed_thread_id} not found in thread stores"
-                )
-
-            resumed_thread = agent.get_new_thread()
-            await resumed_thread.update_from_thread_state(serialized_thread)
-            self.current_thread = resumed_thread
-
-            await supervisor_resumed_thread.update_from_thread_state(
-                supervisor_serialized_thread
+            self.current_thread, supervisor_resumed_thread = await self._load_threads(
+                agent, processed_thread_id
             )
+        self._remember_threads(
+            processed_thread_id, self.current_thread, supervisor_resumed_thread
+        )
 
         # Save the original user message
         self.user_message = user_message
 
         response = await agent.run(user_message, thread=supervisor_resumed_thread)
 
-        # Update thread stores
-        SupervisorAgentA2A.thread_store[processed_thread_id] = (
-            await self.current_thread.serialize()
-        )
-        SupervisorAgentA2A.supervisor_thread_store[processed_thread_id] = (
-            await supervisor_resumed_thread.serialize()
+        # Threads were updated in place
+        await self._save_threads(
+            processed_thread_id, self.current_thread, supervisor_resumed_thread, thread_id is None
         )
 
         return response.text, processed_thread_id
@@ -1,12 +1,26 @@
 from agent_framework.azure import AzureOpenAIChatClient
-from agent_framework import ChatAgent, MCPStreamableHTTPTool
+from agent_framework import ChatAgent
+from app.tools.mcp_tool_registry import get_mcp_tool_registry
 from datetime import datetime
 
+import asyncio
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
 
+# (epoch second, formatted timestamp) of the last prompt timestamp; strftime runs at most once per second
+_LAST_TS: tuple[int, str] = (0, "")
+
+
+def _current_date_time() -> str:
+    global _LAST_TS
+    sec = int(time.time())
+    if sec != _LAST_TS[0]:
+        _LAST_TS = (sec, datetime.fromtimestamp(sec).strftime("%Y-%m-%d %H:%M:%S"))
+    return _LAST_TS[1]
+
 class TransactionAgent :
     instructions = """
     You are a Transaction Agent for BankX, specializing in transaction history, aggregations, and financial insights.
@@ -47,8 +61,8 @@ class TransactionAgent :
     ## Governance: ALWAYS call logDecision after each action
     Example:
     logDecision(
-        conversationId="{conversation_id}",
-        customerId="{customer_id}",
+        conversationId="{{conversation_id}}",
+        customerId="{{customer_id}}",
         agentName="TransactionAgent",
         action="VIEW_TRANSACTIONS",
         input={{"account_id": "CHK-001", "from_date": "2025-10-20", "to_date": "2025-10-26"}},
@@ -79,38 +93,35 @@ class TransactionAgent :
       logger.info("Building request scoped transaction agent run ")
 
       user_mail="bob.user@contoso.com"
-      current_date_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-      full_instruction = TransactionAgent.instructions.format(user_mail=user_mail, current_date_time=current_date_time)
-
-      logger.info("Initializing Account MCP server tools ")
-      account_mcp_server = MCPStreamableHTTPTool(
-        name="Account MCP server client",
-        url=self.account_mcp_server_url
-     )
-      await account_mcp_server.connect()
+      current_date_time = _current_date_time()
+      full_instruction = _STATIC_PROMPT + _DYNAMIC_TAIL.format(user_mail=user_mail, current_date_time=current_date_time)
 
-      logger.info("Initializing Transaction MCP server tools ")
-      transaction_mcp_server = MCPStreamableHTTPTool(
-        name="Transaction MCP server client",
-        url=self.transaction_mcp_server_url
-     )
-      await transaction_mcp_server.connect()
-
-      tools_list = [account_mcp_server, transaction_mcp_server]
+      # MCP connections are pooled process-wide and kept alive by the registry heartbeat
+      registry = get_mcp_tool_registry()
 
+      servers = [
+        ("Account MCP server client", self.account_mcp_server_url),
+        ("Transaction MCP server client", self.transaction_mcp_server_url),
+      ]
       # Add Audit MCP server if provided (for governance logging)
       if self.audit_mcp_server_url:
-          logger.info("Initializing Audit MCP server tools ")
-          audit_mcp_server = MCPStreamableHTTPTool(
-            name="Audit MCP server client",
-            url=self.audit_mcp_server_url
-         )
-          await audit_mcp_server.connect()
-          tools_list.append(audit_mcp_server)
+          servers.append(("Audit MCP server client", self.audit_mcp_server_url))
+
+      # Each tool talks to a distinct server, so cold-start handshakes run concurrently: max(RTT) instead of the sum
+      logger.info("Initializing %d MCP server tools ", len(servers))
+      tools_list = list(await asyncio.gather(
+        *(registry.get(name=name, url=url) for name, url in servers)
+      ))
 
       return ChatAgent(
             chat_client=self.azure_chat_client,
             instructions=full_instruction,
             name=TransactionAgent.name,
             tools=tools_list,
-        )
\ No newline at end of file
+        )
+
+
+# The prompt body is static: render it once at import (unescaping {{ }}) so each build only formats the short tail
+_STATIC_PROMPT, _, _tail = TransactionAgent.instructions.partition("Current user:")
+_STATIC_PROMPT = _STATIC_PROMPT.format()
+_DYNAMIC_TAIL = "Current user:" + _tail
@@ -1,12 +1,18 @@
-from azure.core.credentials import TokenCredential
-from agent_framework.azure import AzureAIClient
-from azure.ai.projects import AIProjectClient
-from agent_framework import ChatAgent, MCPStreamableHTTPTool
-from app.config.azure_credential import get_azure_credential_async
+from agent_framework import ChatAgent
+from app.agents.foundry.agent_ref import parse_agent_ref
+from app.agents.foundry.chat_client_cache import get_chat_client
+from app.auth.user_mapper import lookup_customer_email
+from app.cache.agent_cache import AgentCache
 from app.tools.audited_mcp_tool import AuditedMCPTool
+from app.tools.mcp_tool_registry import get_mcp_tool_registry
 
-import os
+import asyncio
+import functools
 import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from azure.ai.projects import AIProjectClient
 
 
 def get_or_reuse_agent(agent_name: str, agent_id: str | None = None):
@@ -22,7 +28,7 @@ def get_or_reuse_agent(agent_name: str, agent_id: str | None = None):
     - ✅ Works in both local and Azure environments
     """
     if agent_id:
-        print(f"✅ Using pre-configured agent ID for {agent_name}: {agent_id}")
+        logger.info("✅ Using pre-configured agent ID for %s: %s", agent_name, agent_id)
         return agent_id
     
     raise ValueError(
@@ -91,6 +97,13 @@ def get_or_reuse_agent(agent_name: str, agent_id: str | None = None):
 
 logger = logging.getLogger(__name__)
 
+# Built ChatAgents keyed by (agent name, agent version, thread_id, customer_id, user_email)
+_AGENT_CACHE = AgentCache(maxsize=128, ttl_seconds=1800)
+
+# Maximum number of per-user formatted instruction strings kept in memory
+MAX_CACHED_INSTRUCTIONS = 256
+
+
 class AccountAgent :
     instructions = """
     You are a personal financial advisor who helps users with their bank account information.
@@ -123,7 +136,12 @@ class AccountAgent :
     name = "AccountAgent"
     description = "This agent manages user accounts related information such as balance, credit cards, and transaction limits."
 
-    def __init__(self, foundry_project_client: AIProjectClient, 
+    __slots__ = (
+        "foundry_project_client", "chat_deployment_name", "account_mcp_server_url",
+        "limits_mcp_server_url", "foundry_endpoint", "agent_name", "agent_version",
+    )
+
+    def __init__(self, foundry_project_client: "AIProjectClient", 
                  chat_deployment_name:str,
                  account_mcp_server_url: str,
                  limits_mcp_server_url: str,
@@ -138,80 +156,79 @@ class AccountAgent :
         self.foundry_endpoint = foundry_endpoint
         
         # Support both old agent_id and new name:version format
-        if agent_name and agent_version:
-            # V2 format: separate name and version
-            self.agent_name = agent_name
-            self.agent_version = agent_version
-            logger.info(f"✅ Using V2 format: {agent_name}:{agent_version}")
-        elif agent_id:
-            # Try to parse agent_id in format "name:version"
-            if ":" in agent_id:
-                parts = agent_id.split(":", 1)
-                self.agent_name = parts[0]
-                self.agent_version = parts[1]
-                logger.info(f"✅ Parsed V2 format from agent_id: {self.agent_name}:{self.agent_version}")
-            else:
-                # Old asst_* format - not supported
-                raise ValueError(f"Old agent_id format '{agent_id}' not supported. Use agent_name and agent_version instead.")
-        else:
-            raise ValueError("Either (agent_name + agent_version) or agent_id must be provided")
+        self.agent_name, self.agent_version = parse_agent_ref(agent_name, agent_version, agent_id)
         
         # LEGACY: Old approach stored created_agent object, now we just store the ID string
         # self.created_agent = get_or_create_agent(
         #     foundry_project_client, AccountAgent.name, AccountAgent.description, chat_deployment_name, agent_id=agent_id
         # )
         
-        # ChatAgent caching to avoid rebuilding on every request
-        self._cached_chat_agent = None
-        self._cached_thread_id = None
-        
 
 
-    async def _create_mcp_tools(self, customer_id: str = None, thread_id: str = None):
-        """Create fresh MCP tool instances for each request with audit logging"""
-        logger.info("Creating fresh MCP connections for Account and Limits services...")
-        
+    async def _acquire_mcp_tools(self, customer_id: str = None, thread_id: str = None):
+        """Return pooled, connected MCP tools with audit logging for this request.
+
+        Tools are pooled per customer and shared by that customer's concurrent
+        requests, so they are never mutated per request: the audit thread
+        comes from the caller's audit_context around build and run.
+        The registry pings a tool that has been idle past its liveness
+        threshold and transparently reconnects it if the ping fails.
+        """
+        registry = get_mcp_tool_registry()
+
+        def audited(name: str, url: str, server_name: str):
+            return registry.get(
+                name=f"{name} [{customer_id}]",
+                url=url,
+                factory=lambda: AuditedMCPTool(
+                    name=name,
+                    url=url,
+                    customer_id=customer_id,
+                    thread_id=thread_id,
+                    mcp_server_name=server_name
+                )
+            )
+
         # Use AuditedMCPTool for compliance tracking
-        account_mcp_server = AuditedMCPTool(
-            name="Account MCP server client",
-            url=self.account_mcp_server_url,
-            customer_id=customer_id,
-            thread_id=thread_id,
-            mcp_server_name="account"
-        )
-        await account_mcp_server.connect()
-        logger.info("✅ Account MCP connection established (with audit logging)")
-        
-        limits_mcp_server = AuditedMCPTool(
-            name="Limits MCP server client",
-            url=self.limits_mcp_server_url,
-            customer_id=customer_id,
-            thread_id=thread_id,
-            mcp_server_name="limits"
+        account_mcp_server, limits_mcp_server = await asyncio.gather(
+            audited("Account MCP server client", self.account_mcp_server_url, "account"),
+            audited("Limits MCP server client", self.limits_mcp_server_url, "limits"),
         )
-        await limits_mcp_server.connect()
-        logger.info("✅ Limits MCP connection established (with audit logging)")
+        logger.info("✅ Account and Limits MCP connections ready (with audit logging)")
         
         return account_mcp_server, limits_mcp_server
 
     async def build_af_agent(self, thread_id: str | None, customer_id: str = None, user_email: str = None) -> ChatAgent:
-        """Build agent for this request with fresh MCP connection
+        """Build agent for this request with pooled MCP connections
         
         Args:
             thread_id: Thread ID for conversation continuity
             customer_id: Customer ID for audit logging (e.g., CUST-002)
             user_email: User's email/UPN from access token (e.g., nattaporn.suksawat@example.com)
         """
-        # Check cache first
-        if self._cached_chat_agent is not None and self._cached_thread_id == thread_id:
-            logger.info(f"⚡ [CACHE HIT] Reusing cached AccountAgent for thread={thread_id}")
-            print(f"⚡ [CACHE HIT] Reusing cached AccountAgent")
-            return self._cached_chat_agent
+        cache_key = (self.agent_name, self.agent_version, thread_id, customer_id, user_email)
         
-        logger.info(f"Building AccountAgent for thread={thread_id}, customer={customer_id}, email={user_email}")
+        chat_agent = _AGENT_CACHE.get(cache_key)
+        if chat_agent is not None:
+            # A cached agent whose pooled MCP tools have since been reconnected is
+            # rebuilt, so callers never run against a closed connection
+            tools = await self._acquire_mcp_tools(customer_id=customer_id, thread_id=thread_id)
+            if all(tool is cached for tool, cached in zip(tools, chat_agent._mcp_tools)):
+                logger.info("⚡ [CACHE HIT] Reusing cached AccountAgent for thread=%s", thread_id)
+                return chat_agent
+            logger.info("♻️ [CACHE STALE] MCP tools reconnected, rebuilding AccountAgent for thread=%s", thread_id)
+            _AGENT_CACHE.invalidate(cache_key)
+        
+        return await _AGENT_CACHE.get_or_build(
+            cache_key, lambda: self._build_chat_agent(thread_id, customer_id, user_email)
+        )
+
+    async def _build_chat_agent(self, thread_id: str | None, customer_id: str = None, user_email: str = None) -> ChatAgent:
+        """Build a new ChatAgent with MCP tools and user-specific instructions."""
+        logger.info("Building AccountAgent for thread=%s, customer=%s, email=%s", thread_id, customer_id, user_email)
         
-        # Create fresh MCP connections for this request with audit tracking
-        account_mcp_server, limits_mcp_server = await self._create_mcp_tools(
+        # Get pooled MCP connections for this request with audit tracking
+        account_mcp_server, limits_mcp_server = await self._acquire_mcp_tools(
             customer_id=customer_id,
             thread_id=thread_id
         )
@@ -219,37 +236,16 @@ class AccountAgent :
         # Use provided user_email (UPN from token) or lookup from customer_id
         if user_email:
             user_mail = user_email
-            print(f"📧 [ACCOUNT_AGENT] Using provided email: {user_mail}")
+            logger.debug("📧 [ACCOUNT_AGENT] Using provided email: %s", user_mail)
         else:
-            # Fallback: lookup email from customer_id
-            from app.auth.user_mapper import get_user_mapper
-            
-            try:
-                user_mapper = get_user_mapper()
-                customer_info = user_mapper.get_customer_info(customer_id)
-                
-                if customer_info:
-                    user_mail = customer_info.get("email")
-                    print(f"📧 [ACCOUNT_AGENT] Looked up email for {customer_id}: {user_mail}")
-                else:
-                    user_mail = "somchai.rattanakorn@example.com"
-                    print(f"⚠️ [ACCOUNT_AGENT] No customer found for {customer_id}, using default")
-            except Exception as e:
-                print(f"❌ [ACCOUNT_AGENT] Error looking up customer: {e}")
-                user_mail = "somchai.rattanakorn@example.com"
-                print(f"⚠️ [ACCOUNT_AGENT] Using default email due to error")
+            # Fallback: the user_mapper lookup may read customers.json, so keep it off the event loop
+            user_mail = await asyncio.to_thread(lookup_customer_email, customer_id)
         
-        full_instruction = AccountAgent.instructions.format(user_mail=user_mail)
+        full_instruction = _format_instructions(user_mail)
 
-        credential = await get_azure_credential_async()
+        # Reuse the process-wide AzureAIClient (and its connection pool) for this agent
+        chat_client = get_chat_client(self.foundry_project_client, self.agent_name, self.agent_version)
 
-        # Create AzureAIClient with agent name and version
-        chat_client = AzureAIClient(
-            project_client=self.foundry_project_client,
-            agent_name=self.agent_name,
-            agent_version=self.agent_version
-        )
-        
         # Create ChatAgent using create_agent() method with tools
         chat_agent = chat_client.create_agent(
             name=AccountAgent.name,
@@ -260,10 +256,21 @@ class AccountAgent :
         # Store reference to MCP tools so we can update thread context later
         chat_agent._mcp_tools = [account_mcp_server, limits_mcp_server]
         
-        # Cache the agent for future requests
-        self._cached_chat_agent = chat_agent
-        self._cached_thread_id = thread_id
-        logger.info(f"💾 [CACHE STORED] AccountAgent cached for thread={thread_id}")
-        print(f"💾 [CACHE STORED] AccountAgent cached")
-        
-        return chat_agent
\ No newline at end of file
+        return chat_agent
+
+
+# Only {user_mail} varies, so split the template once instead of re-parsing it per build.
+# The result stays a str: create_agent() requires one and the client JSON-encodes the
+# whole request body, so a pre-encoded UTF-8 copy would never be reused on the wire.
+_INSTRUCTIONS_PREFIX, _INSTRUCTIONS_SUFFIX = AccountAgent.instructions.split("{user_mail}")
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_INSTRUCTIONS)
+def _format_instructions(user_mail: str) -> str:
+    """
+    Equivalent to AccountAgent.instructions.format(user_mail=user_mail).
+
+    Memoized per user_mail and only reached on a ChatAgent cache miss, so a
+    returning user on a new thread reuses the already assembled string.
+    """
+    return f"{_INSTRUCTIONS_PREFIX}{user_mail}{_INSTRUCTIONS_SUFFIX}"
@@ -0,0 +1,51 @@
+"""
+Agent reference parsing shared by the Azure AI Foundry agents.
+
+Foundry V2 agents are addressed by name and version. Both can be given
+separately, or combined in a legacy agent_id of the form "name:version".
+"""
+
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_AGENT_REFS = 128
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_AGENT_REFS)
+def parse_agent_ref(
+    agent_name: str | None,
+    agent_version: str | None,
+    agent_id: str | None,
+) -> tuple[str, str]:
+    """
+    Resolve the (agent_name, agent_version) pair of a Foundry V2 agent.
+
+    Results are cached, so the resolution is logged once per distinct reference
+    rather than on every agent construction.
+
+    Args:
+        agent_name: Agent name for V2 format
+        agent_version: Agent version for V2 format
+        agent_id: Combined "name:version" reference, used when name/version are not given
+
+    Returns:
+        The (agent_name, agent_version) tuple
+
+    Raises:
+        ValueError: If neither form is provided, or agent_id is an old asst_* ID
+    """
+    if agent_name and agent_version:
+        logger.info("✅ Using V2 format: %s:%s", agent_name, agent_version)
+        return agent_name, agent_version
+
+    if agent_id:
+        name, sep, version = agent_id.partition(":")
+        if not sep:
+            # Old asst_* format - not supported
+            raise ValueError(f"Old agent_id format '{agent_id}' not supported. Use agent_name and agent_version instead.")
+        logger.info("✅ Parsed V2 format from agent_id: %s:%s", name, version)
+        return name, version
+
+    raise ValueError("Either (agent_name + agent_version) or agent_id must be provided")
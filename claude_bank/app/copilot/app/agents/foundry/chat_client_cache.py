@@ -0,0 +1,51 @@
+"""
+Process-wide AzureAIClient instances for the Azure AI Foundry agents.
+
+An AzureAIClient wraps the HTTP connection pool to the Foundry endpoint, so
+rebuilding ChatAgents on the same client keeps TCP/TLS connections warm
+instead of opening new ones on every cache-miss build.
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureAIClient
+    from azure.ai.projects import AIProjectClient
+
+logger = logging.getLogger(__name__)
+
+# Keyed by (id(project_client), agent_name, agent_version). The cached client
+# holds a reference to its project client, so the id cannot be reused while
+# the entry exists. Entries are never evicted: the container builds each agent
+# once on the single project client, so the cache holds at most one client per
+# configured Foundry agent.
+_CLIENT_CACHE: dict[tuple[int, str, str], "AzureAIClient"] = {}
+
+
+def get_chat_client(project_client: "AIProjectClient", agent_name: str, agent_version: str) -> "AzureAIClient":
+    """
+    Return the shared AzureAIClient for a Foundry agent, creating it on first use.
+
+    Args:
+        project_client: Azure AI Foundry project client
+        agent_name: Agent name (V2 format)
+        agent_version: Agent version (V2 format)
+
+    Returns:
+        The AzureAIClient bound to this agent name and version
+    """
+    key = (id(project_client), agent_name, agent_version)
+    chat_client = _CLIENT_CACHE.get(key)
+    if chat_client is None:
+        from agent_framework.azure import AzureAIClient
+
+        # No await between lookup and insert, so concurrent builds cannot race here
+        chat_client = AzureAIClient(
+            project_client=project_client,
+            agent_name=agent_name,
+            agent_version=agent_version
+        )
+        _CLIENT_CACHE[key] = chat_client
+        logger.info("🔌 Created AzureAIClient for %s:%s", agent_name, agent_version)
+    return chat_client
@@ -5,21 +5,37 @@ Purpose: Email notifications for support tickets and escalations
 
 import os
 import logging
-from typing import Any
-from azure.ai.projects import AIProjectClient
-from agent_framework.azure import AzureAIClient
-from agent_framework import ChatAgent, MCPStreamableHTTPTool
-from app.config.azure_credential import get_azure_credential_async
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+from agent_framework import ChatAgent
+from app.cache.agent_cache import AgentCache
+from app.agents.foundry.agent_ref import parse_agent_ref
+from app.agents.foundry.chat_client_cache import get_chat_client
+from app.tools.mcp_tool_registry import get_mcp_tool_registry
+
+if TYPE_CHECKING:
+    from azure.ai.projects import AIProjectClient
 
 logger = logging.getLogger(__name__)
 
+# Built ChatAgents, shared by every EscalationCommsAgent instance
+_AGENT_CACHE = AgentCache(maxsize=64, ttl_seconds=1800)
+
+# Docker mode: use pre-configured agents only. Read once at import; the
+# environment does not change for the life of the process.
+_USE_PREBUILT_ONLY = os.environ.get('USE_PREBUILT_AGENTS_ONLY', '').strip().lower() in {'1', 'true', 'yes'}
+
+
+class AgentReference(NamedTuple):
+    """Simple agent reference for V2 format"""
+    id: str  # V2 format: name:version
+    name: str
+
 
 def get_or_create_agent(foundry_client, agent_name: str, agent_description: str, model_deployment: str, agent_id: str | None = None):
     """Check if agent exists, if not create it. Returns the agent object (or agent_id string in Docker mode)."""
-    # Check if we're in Docker mode (use pre-configured agents only)
-    use_prebuilt_only = os.getenv('USE_PREBUILT_AGENTS_ONLY', 'false').lower() == 'true'
-    
-    if use_prebuilt_only:
+    if _USE_PREBUILT_ONLY:
         # Docker mode: Use pre-configured agent ID only (SDK may not support agent creation)
         if agent_id:
             print(f"✅ [DOCKER MODE] Using pre-configured agent ID for {agent_name}: {agent_id}")
@@ -33,14 +49,15 @@ def get_or_create_agent(foundry_client, agent_name: str, agent_description: str,
     # Agents must already exist in Azure AI Foundry portal
     # No need to create/check - just use the reference
     print(f"✅ Using agent name (V2 format): {agent_name}:v1")
-    
-    class AgentReference:
-        """Simple agent reference for V2 format"""
-        def __init__(self, name):
-            self.id = f"{name}:v1"  # V2 format: name:version
-            self.name = name
-    
-    return AgentReference(agent_name)
+    return AgentReference(id=f"{agent_name}:v1", name=agent_name)
+
+
+# Static system prompt, read once at import from the UTF-8 asset next to this
+# module. Keep it free of per-request interpolation so the prefix sent with
+# every call stays byte-identical and eligible for provider-side prompt
+# caching; per-request context belongs in the user message instead.
+# Kept as an interned str; the SDK JSON-encodes it, so pre-encoded bytes would go unused.
+_INSTRUCTIONS = sys.intern((Path(__file__).parent / "escalation_comms_instructions.txt").read_text(encoding="utf-8").strip())
 
 
 class EscalationCommsAgent:
@@ -60,46 +77,11 @@ class EscalationCommsAgent:
     name = "EscalationCommsAgent"
     description = "Sends email notifications for support tickets and escalations via Azure Communication Services"
     
-    instructions = """You are the EscalationComms Agent for BankX, specialized in sending email notifications for support tickets and customer escalations.
-
-**Your Core Responsibilities:**
-1. Send email notifications when support tickets are created
-2. Send ticket confirmation emails to customers
-3. Ensure all notifications are properly formatted and delivered
-4. Handle email sending with appropriate error handling
-
-**Available Tools:**
-1. **send_email**: Send a generic email
-   - Use for custom email scenarios
-   - Requires: recipient email, subject, body, optional CC/BCC
-   
-2. **send_ticket_notification**: Send formatted support ticket notification
-   - Use when a support ticket is created
-   - Automatically formats email with ticket details
-   - Requires: ticket_id, customer_email, customer_name, query, category
-   - Sends confirmation to customer with ticket ID and details
-
-**Email Sending Guidelines:**
-- ALWAYS validate email addresses before sending
-- Include clear ticket IDs in subject lines
-- Format emails professionally with proper HTML structure
-- Handle errors gracefully and report failures clearly
-- Confirm successful sends with message IDs
-**Example Flow:**
-User: "Send ticket notification for TKT-20251112-000001"
-1. Call send_ticket_notification with ticket details
-2. Confirm email sent successfully
-3. Report message ID if available
-
-**Important:**
-- All emails are sent via Azure Communication Services
-- Emails are automatically CC'd to support team in dev/test mode
-- Always confirm receipt or report errors clearly
-"""
+    instructions = _INSTRUCTIONS
 
     def __init__(
         self,
-        foundry_project_client: AIProjectClient,
+        foundry_project_client: "AIProjectClient",
         chat_deployment_name: str,
         escalation_comms_mcp_server_url: str = None,
         foundry_endpoint: str = None,
@@ -125,74 +107,49 @@ User: "Send ticket notification for TKT-20251112-000001"
         self.foundry_endpoint = foundry_endpoint
         
         # Support both old agent_id and new name:version format
-        if agent_name and agent_version:
-            self.agent_name = agent_name
-            self.agent_version = agent_version
-            logger.info(f"✅ Using V2 format: {agent_name}:{agent_version}")
-        elif agent_id:
-            if ":" in agent_id:
-                parts = agent_id.split(":", 1)
-                self.agent_name = parts[0]
-                self.agent_version = parts[1]
-                logger.info(f"✅ Parsed V2 format from agent_id: {self.agent_name}:{self.agent_version}")
-            else:
-                raise ValueError(f"Old agent_id format '{agent_id}' not supported. Use agent_name and agent_version instead.")
-        else:
-            raise ValueError("Either (agent_name + agent_version) or agent_id must be provided")
+        self.agent_name, self.agent_version = parse_agent_ref(agent_name, agent_version, agent_id)
         
         logger.info("EscalationCommsAgent initialized with Azure AI Foundry")
         logger.info(f"  EscalationComms MCP Server: {escalation_comms_mcp_server_url}")
         logger.info(f"  Agent: {self.agent_name}:{self.agent_version}")
-        
-        # ChatAgent caching to avoid rebuilding on every request
-        self._cached_chat_agent = None
-        self._cached_thread_id = None
 
     async def build_af_agent(self, thread_id: str | None) -> ChatAgent:
-        """Build agent for this request with fresh MCP connection"""
-        # Check cache first
-        if self._cached_chat_agent is not None and self._cached_thread_id == thread_id:
-            logger.info(f"⚡ [CACHE HIT] Reusing cached EscalationCommsAgent for thread={thread_id}")
-            print(f"⚡ [CACHE HIT] Reusing cached EscalationCommsAgent")
-            return self._cached_chat_agent
+        """Build agent for this request, reusing a process-wide cached ChatAgent"""
+        cache_key = (self.agent_name, self.agent_version, thread_id, self.escalation_comms_mcp_server_url)
+        chat_agent = _AGENT_CACHE.get(cache_key)
+        if chat_agent is not None:
+            logger.info("⚡ [CACHE HIT] Reusing cached EscalationCommsAgent for thread=%s", thread_id)
+            return chat_agent
         
+        return await _AGENT_CACHE.get_or_build(cache_key, lambda: self._build_chat_agent(thread_id))
+
+    async def _build_chat_agent(self, thread_id: str | None) -> ChatAgent:
+        """Build a new ChatAgent with a pooled EscalationComms MCP connection"""
         logger.info("Building EscalationCommsAgent for thread")
         
-        # Create MCP connection for EscalationComms server
+        # Get pooled MCP connection for EscalationComms server
         tools_list = []
         
         if self.escalation_comms_mcp_server_url:
-            logger.info(f"Connecting to EscalationComms MCP server: {self.escalation_comms_mcp_server_url}")
-            escalation_mcp_server = MCPStreamableHTTPTool(
+            escalation_mcp_server = await get_mcp_tool_registry().get(
                 name="EscalationComms MCP server client",
                 url=self.escalation_comms_mcp_server_url
             )
-            await escalation_mcp_server.connect()
             tools_list.append(escalation_mcp_server)
-            logger.info("✅ EscalationComms MCP connection established")
+            logger.info("✅ EscalationComms MCP connection ready")
         else:
             logger.warning("⚠️  No EscalationComms MCP server URL provided")
         
-        credential = await get_azure_credential_async()
-        
-        # Create AzureAIClient with agent name and version
-        chat_client = AzureAIClient(
-            project_client=self.foundry_project_client,
-            agent_name=self.agent_name,
-            agent_version=self.agent_version
-        )
+        # Reuse the process-wide AzureAIClient (and its connection pool) for this agent
+        chat_client = get_chat_client(self.foundry_project_client, self.agent_name, self.agent_version)
         
         # Create ChatAgent using create_agent() method with tools
         chat_agent = chat_client.create_agent(
             name=EscalationCommsAgent.name,
-            instructions=EscalationCommsAgent.instructions,
+            instructions=_INSTRUCTIONS,
             tools=tools_list
         )
         
-        # Cache the agent for future requests
-        self._cached_chat_agent = chat_agent
-        self._cached_thread_id = thread_id
-        logger.info(f"💾 [CACHE STORED] EscalationCommsAgent cached for thread={thread_id}")
-        print(f"💾 [CACHE STORED] EscalationCommsAgent cached")
+        logger.info("💾 [CACHE STORED] EscalationCommsAgent cached for thread=%s", thread_id)
         
         return chat_agent
@@ -6,7 +6,7 @@ UC2: Product Information & FAQ with RAG-based search
 import logging
 from typing import Any
 from azure.ai.projects import AIProjectClient
-from agent_framework.azure import AzureAIClient
+from app.agents.foundry.chat_client_cache import get_chat_client
 from agent_framework import ChatAgent, MCPStreamableHTTPTool
 from app.config.azure_credential import get_azure_credential_async
 
@@ -198,12 +198,8 @@ User: "What is the minimum balance for a savings account?"
         
         credential = await get_azure_credential_async()
         
-        # Create AzureAIClient with agent name and version
-        chat_client = AzureAIClient(
-            project_client=self.foundry_project_client,
-            agent_name=self.agent_name,
-            agent_version=self.agent_version
-        )
+        # Reuse the process-wide AzureAIClient (and its connection pool) for this agent
+        chat_client = get_chat_client(self.foundry_project_client, self.agent_name, self.agent_version)
         
         # Create ChatAgent using create_agent() method with tools
         chat_agent = chat_client.create_agent(
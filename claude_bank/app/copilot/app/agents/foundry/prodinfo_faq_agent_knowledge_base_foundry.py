@@ -10,7 +10,7 @@ product documents in the vector store for grounding.
 import logging
 from typing import Any
 from azure.ai.projects import AIProjectClient
-from agent_framework.azure import AzureAIClient
+from app.agents.foundry.chat_client_cache import get_chat_client
 from agent_framework import ChatAgent, MCPStreamableHTTPTool, HostedFileSearchTool
 from app.config.azure_credential import get_azure_credential_async
 
@@ -298,12 +298,8 @@ You: "I cannot help with that. I specialize in BankX banking products and servic
         else:
             credential = await get_azure_credential_async()
         
-        # Create AzureAIClient with agent name and version
-        chat_client = AzureAIClient(
-            project_client=self.foundry_project_client,
-            agent_name=self.agent_name,
-            agent_version=self.agent_version
-        )
+        # Reuse the process-wide AzureAIClient (and its connection pool) for this agent
+        chat_client = get_chat_client(self.foundry_project_client, self.agent_name, self.agent_version)
         
         # Create ChatAgent using create_agent() method
         chat_agent = chat_client.create_agent(
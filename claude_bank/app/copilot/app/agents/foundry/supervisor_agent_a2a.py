@@ -15,6 +15,7 @@ import json
 from typing import AsyncGenerator
 from openai import AsyncAzureOpenAI
 from app.config.settings import settings
+from app.tools.audited_mcp_tool import audit_context
 
 logger = logging.getLogger(__name__)
 
@@ -321,17 +322,19 @@ class SupervisorAgentA2A:
             # Extract customer_id
             customer_id = self.user_context.customer_id if self.user_context else "Somchai"
             
-            # Build OLD agent
-            af_account_agent = await self.account_agent_old.build_af_agent(thread_id, customer_id=customer_id)
-            
-            # Set thread context on MCP tools
-            if hasattr(af_account_agent, '_mcp_tools'):
-                for tool in af_account_agent._mcp_tools:
-                    if hasattr(tool, 'set_thread_context'):
-                        tool.set_thread_context(self.current_thread)
-            
-            # Execute OLD agent
-            response = await af_account_agent.run(user_message, thread=self.current_thread)
+            # Pooled MCP tools read the audit customer and thread from this request's context
+            with audit_context(customer_id, thread_id):
+                # Build OLD agent
+                af_account_agent = await self.account_agent_old.build_af_agent(thread_id, customer_id=customer_id)
+                
+                # Set thread context on MCP tools
+                if hasattr(af_account_agent, '_mcp_tools'):
+                    for tool in af_account_agent._mcp_tools:
+                        if hasattr(tool, 'set_thread_context'):
+                            tool.set_thread_context(self.current_thread)
+                
+                # Execute OLD agent
+                response = await af_account_agent.run(user_message, thread=self.current_thread)
             
             logger.info(f"✅ [OLD] Received response from AccountAgent (in-process)")
             return response.text
@@ -484,8 +487,9 @@ class SupervisorAgentA2A:
                 logger.info("🔄 [OLD] Routing to PaymentAgent (in-process)")
                 if self.payment_agent_old:
                     customer_id = self.user_context.customer_id if self.user_context else "Somchai"
-                    af_payment_agent = await self.payment_agent_old.build_af_agent(initial_thread_id, customer_id=customer_id)
-                    response = await af_payment_agent.run(user_message, thread=self.current_thread)
+                    with audit_context(customer_id, initial_thread_id):
+                        af_payment_agent = await self.payment_agent_old.build_af_agent(initial_thread_id, customer_id=customer_id)
+                        response = await af_payment_agent.run(self.payment_agent_old.with_current_timestamp(user_message), thread=self.current_thread)
                     result = response.text
                 else:
                     result = "Payment agent not available"
@@ -19,6 +19,7 @@ from app.config.azure_credential import get_azure_credential_async
 from app.config.settings import settings
 from app.cache.user_cache import get_cache_manager
 from app.conversation_state_manager import get_conversation_state_manager
+from app.tools.audited_mcp_tool import audit_context, reset_audit_context, set_audit_context
 import sys
 from pathlib import Path
 import logging
@@ -1254,19 +1255,21 @@ Available data:
        customer_id = self.user_context.customer_id if self.user_context else "Somchai"
        user_email = self.user_context.entra_user_email if self.user_context else None
        print(f"👤 [ROUTE] Using customer_id: {customer_id}, email: {user_email}")
-       af_account_agent = await self.account_agent.build_af_agent(
-           initial_thread_id, 
-           customer_id=customer_id,
-           user_email=user_email
-       )
-       
-       # Set thread context on MCP tools so they can get actual thread_id
-       if hasattr(af_account_agent, '_mcp_tools'):
-           for tool in af_account_agent._mcp_tools:
-               if hasattr(tool, 'set_thread_context'):
-                   tool.set_thread_context(self.current_thread)
-       
-       response = await af_account_agent.run(user_message, thread=self.current_thread)
+       # Pooled MCP tools read the audit customer and thread from this request's context
+       with audit_context(customer_id, initial_thread_id):
+           af_account_agent = await self.account_agent.build_af_agent(
+               initial_thread_id, 
+               customer_id=customer_id,
+               user_email=user_email
+           )
+           
+           # Set thread context on MCP tools so they can get actual thread_id
+           if hasattr(af_account_agent, '_mcp_tools'):
+               for tool in af_account_agent._mcp_tools:
+                   if hasattr(tool, 'set_thread_context'):
+                       tool.set_thread_context(self.current_thread)
+           
+           response = await af_account_agent.run(user_message, thread=self.current_thread)
        
        # Get ACTUAL thread_id after execution (now it definitely exists)
        actual_thread_id = self.current_thread.service_thread_id if self.current_thread else None
@@ -1344,20 +1347,22 @@ Available data:
     #    print(f"👤 [CONTEXT] Using customer_id: {customer_id}")
     #    print(f"🔧 [BUILD] Building AccountAgent...")
 
-       af_transaction_agent = await self.transaction_agent.build_af_agent(
-           initial_thread_id,
-           customer_id=customer_id,
-           user_email=user_email
-       )
-       
-       # Set thread context on MCP tools so they can get actual thread_id
-       if hasattr(af_transaction_agent, '_mcp_tools'):
-           for tool in af_transaction_agent._mcp_tools:
-               if hasattr(tool, 'set_thread_context'):
-                   tool.set_thread_context(self.current_thread)
-       
-       print(f"🤖 [EXECUTE] Running TransactionAgent...")
-       response = await af_transaction_agent.run(user_message, thread=self.current_thread)
+       # The thread context set on the MCP tools is request-scoped and reset when this block exits
+       with audit_context(customer_id, initial_thread_id):
+           af_transaction_agent = await self.transaction_agent.build_af_agent(
+               initial_thread_id,
+               customer_id=customer_id,
+               user_email=user_email
+           )
+           
+           # Set thread context on MCP tools so they can get actual thread_id
+           if hasattr(af_transaction_agent, '_mcp_tools'):
+               for tool in af_transaction_agent._mcp_tools:
+                   if hasattr(tool, 'set_thread_context'):
+                       tool.set_thread_context(self.current_thread)
+           
+           print(f"🤖 [EXECUTE] Running TransactionAgent...")
+           response = await af_transaction_agent.run(user_message, thread=self.current_thread)
        
        # Get actual thread_id after execution
        actual_thread_id = self.current_thread.service_thread_id if self.current_thread else None
@@ -1429,20 +1434,22 @@ Available data:
            user_email = self.user_context.entra_user_email if self.user_context else None
            print(f"👤 [CONTEXT] Using customer_id: {customer_id}, user_email: {user_email}")
            print(f"🔧 [BUILD] Building PaymentAgent...")
-           af_payment_agent = await self.payment_agent.build_af_agent(initial_thread_id, customer_id=customer_id, user_email=user_email)
-           print(f"✅ [BUILD] PaymentAgent built successfully")
-           logger.info("✅ PaymentAgent built successfully with thread context")
-           
-           # Set thread context on MCP tools so they can get actual thread_id
-           if hasattr(af_payment_agent, '_mcp_tools'):
-               for tool in af_payment_agent._mcp_tools:
-                   if hasattr(tool, 'set_thread_context'):
-                       tool.set_thread_context(self.current_thread)
-           
-           # Pass the conversation context including previous messages
-           # This ensures the PaymentAgent knows about previous confirmations
-           print(f"🤖 [EXECUTE] Running PaymentAgent...")
-           response = await af_payment_agent.run(user_message, thread=self.current_thread)
+           # Pooled MCP tools read the audit customer and thread from this request's context
+           with audit_context(customer_id, initial_thread_id):
+               af_payment_agent = await self.payment_agent.build_af_agent(initial_thread_id, customer_id=customer_id, user_email=user_email)
+               print(f"✅ [BUILD] PaymentAgent built successfully")
+               logger.info("✅ PaymentAgent built successfully with thread context")
+               
+               # Set thread context on MCP tools so they can get actual thread_id
+               if hasattr(af_payment_agent, '_mcp_tools'):
+                   for tool in af_payment_agent._mcp_tools:
+                       if hasattr(tool, 'set_thread_context'):
+                           tool.set_thread_context(self.current_thread)
+               
+               # Pass the conversation context including previous messages
+               # This ensures the PaymentAgent knows about previous confirmations
+               print(f"🤖 [EXECUTE] Running PaymentAgent...")
+               response = await af_payment_agent.run(self.payment_agent.with_current_timestamp(user_message), thread=self.current_thread)
            
            # Get actual thread_id after execution
            actual_thread_id = self.current_thread.service_thread_id if self.current_thread else None
@@ -1984,6 +1991,9 @@ async def _stream_specialist_agent(
     """
     import time
     
+    # Set for the whole stream: tools run while the caller iterates, and are reset when it finishes
+    customer_id = user_context.customer_id if user_context else "Somchai"
+    audit_tokens = set_audit_context(customer_id, thread_id)
     try:
         # Emit gathering_data step
         gathering_start = time.time()
@@ -1996,9 +2006,6 @@ async def _stream_specialist_agent(
         })
         
         # Build the agent with the thread context (it's cached so fast)
-        # Determine customer_id from user_context
-        customer_id = user_context.customer_id if user_context else "Somchai"
-        
         # Build agent (will use cached version if available)
         af_agent = await agent_instance.build_af_agent(thread_id, customer_id=customer_id)
         
@@ -2027,6 +2034,10 @@ async def _stream_specialist_agent(
             "timestamp": time.time()
         })
         
+        # PaymentAgent expects the current time in the user message, not its prompt
+        if hasattr(agent_instance, 'with_current_timestamp'):
+            user_message = agent_instance.with_current_timestamp(user_message)
+        
         # Stream the response from the agent
         full_response = ""
         async for chunk in af_agent.run_stream(user_message, thread=thread):
@@ -2053,4 +2064,12 @@ async def _stream_specialist_agent(
     except Exception as e:
         logger.error(f"Error in specialist agent stream: {e}", exc_info=True)
         yield (f"An error occurred: {str(e)}", True, thread_id, None)
+    finally:
+        try:
+            reset_audit_context(audit_tokens)
+        except ValueError:
+            # Finalized outside the caller's context (e.g. by the event loop's
+            # async generator hook); the values were set in a context that is
+            # being discarded, so there is nothing left to restore
+            pass
 
@@ -3,8 +3,10 @@ User mapper to map Entra ID email/UPN to BankX customer_id.
 Reads from dynamic_data/customers.json to find matching customer.
 """
 import json
+import logging
 import os
 import sys
+import time
 from typing import Optional, Dict, Any
 from pathlib import Path
 
@@ -12,6 +14,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent / "app" / "common"))
 from path_utils import get_dynamic_data_dir
 
+logger = logging.getLogger(__name__)
+
+# Fallback identity used in agent prompts when a customer's email is unknown
+DEFAULT_USER_EMAIL = "somchai.rattanakorn@example.com"
+
+# customer_id -> email lookups are effectively static; cache them for an hour
+EMAIL_CACHE_TTL_SECONDS = 3600.0
+MAX_CACHED_EMAILS = 10_000
+_email_cache: Dict[str, tuple[float, str]] = {}
+
 
 class UserMapper:
     """
@@ -114,3 +126,40 @@ def get_user_mapper() -> UserMapper:
     if _user_mapper is None:
         _user_mapper = UserMapper()
     return _user_mapper
+
+
+def lookup_customer_email(customer_id: Optional[str]) -> str:
+    """
+    Resolve a customer's email for agent instructions.
+
+    Successful lookups are cached for EMAIL_CACHE_TTL_SECONDS. An unknown
+    customer, a record without an email or a lookup error falls back to
+    DEFAULT_USER_EMAIL and is not cached, so it is retried on the next build.
+    May read customers.json on first use, so call it off the event loop.
+
+    Args:
+        customer_id: Customer ID (CUST-XXX format)
+
+    Returns:
+        The customer's email, or DEFAULT_USER_EMAIL if it cannot be resolved
+    """
+    cached = _email_cache.get(customer_id)
+    if cached and time.monotonic() - cached[0] < EMAIL_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    try:
+        customer_info = get_user_mapper().get_customer_info(customer_id)
+    except Exception as e:
+        logger.warning("❌ [USER_MAPPER] Error looking up customer %s, using default email: %s", customer_id, e)
+        return DEFAULT_USER_EMAIL
+
+    user_mail = customer_info.get("email") if customer_info else None
+    if not user_mail:
+        logger.warning("⚠️ [USER_MAPPER] No email found for %s, using default", customer_id)
+        return DEFAULT_USER_EMAIL
+
+    logger.debug("📧 [USER_MAPPER] Found email for %s: %s", customer_id, user_mail)
+    if len(_email_cache) >= MAX_CACHED_EMAILS:
+        _email_cache.clear()
+    _email_cache[customer_id] = (time.monotonic(), user_mail)
+    return user_mail
@@ -1,4 +1,18 @@
 """User data caching module for fast UC1 responses."""
 from .user_cache import UserCacheManager, get_cache_manager
+from .thread_store import ThreadStore, InMemoryThreadStore, RedisThreadStore, get_thread_store, close_thread_store
+from .response_cache import ResponseCache, get_response_cache
+from .agent_cache import AgentCache
 
-__all__ = ["UserCacheManager", "get_cache_manager"]
+__all__ = [
+    "UserCacheManager",
+    "get_cache_manager",
+    "ThreadStore",
+    "InMemoryThreadStore",
+    "RedisThreadStore",
+    "get_thread_store",
+    "close_thread_store",
+    "ResponseCache",
+    "get_response_cache",
+    "AgentCache",
+]
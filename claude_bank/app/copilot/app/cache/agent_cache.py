@@ -0,0 +1,81 @@
+"""
+Cache of built ChatAgents, shared by the Foundry and Azure chat agent stacks.
+
+Building a ChatAgent is slow (MCP handshakes, client setup), so built agents
+are shared across agent wrapper instances and requests. Entries expire
+after a TTL and the least recently used entry is evicted beyond maxsize.
+Concurrent misses for the same key wait on a per-key lock and build once.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64
+DEFAULT_TTL_SECONDS = 1800.0
+
+
+class AgentCache:
+    """TTL + LRU cache of ChatAgents with per-key build locks."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached agent for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, agent = entry
+        if time.monotonic() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return agent
+
+    def put(self, key: Hashable, agent: Any) -> None:
+        """Store agent under key, evicting the least recently used beyond maxsize."""
+        self._entries[key] = (time.monotonic(), agent)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the cached agent for key so the next get_or_build() rebuilds it."""
+        self._entries.pop(key, None)
+
+    async def get_or_build(self, key: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached agent for key, building it with build() on a miss.
+
+        Args:
+            key: Cache key (e.g., agent name, version and thread_id)
+            build: Coroutine function that builds a new agent
+
+        Returns:
+            The cached or newly built agent
+        """
+        agent = self.get(key)
+        if agent is not None:
+            return agent
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have built this agent while we waited
+            agent = self.get(key)
+            if agent is not None:
+                return agent
+            try:
+                agent = await build()
+            finally:
+                # Waiters hold their own reference; later callers hit the cache
+                self._locks.pop(key, None)
+            self.put(key, agent)
+            return agent
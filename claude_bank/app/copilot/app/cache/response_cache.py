@@ -0,0 +1,97 @@
+"""
+Response Cache - per-thread cache of answers to repeated questions.
+
+A user asking the same product/FAQ question twice in a conversation should not
+pay for a second supervisor + sub-agent round-trip. Questions are keyed by their
+normalized text (lowercased, punctuation and extra whitespace dropped), so only
+a repeat of the same words in the same order hits: swapping the subjects of a
+comparison or changing a figure is a different question.
+
+Only answers from static-knowledge agents should be cached: account balances,
+transactions and payment flows change between turns.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Response cache configuration
+ENTRIES_PER_THREAD = 32  # Most recent questions kept per thread
+MAX_THREADS = 10_000
+TTL_SECONDS = 600
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_question(text: str) -> str:
+    """Cache key for a question: its lowercased words and numbers, in order."""
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+class ResponseCache:
+    """Per-thread LRU maps of normalized question -> (expiry, response).
+
+    Responses are usually answer text, but any object (e.g. an agent run
+    response) can be cached.
+    """
+
+    def __init__(
+        self,
+        entries_per_thread: int = ENTRIES_PER_THREAD,
+        max_threads: int = MAX_THREADS,
+        ttl_seconds: int = TTL_SECONDS,
+    ):
+        self.entries_per_thread = entries_per_thread
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self._threads: OrderedDict[str, OrderedDict[str, Tuple[float, Any]]] = OrderedDict()
+
+    def lookup(self, thread_id: str, user_message: str) -> Optional[Any]:
+        """Return the cached response to the same question in this thread, if any."""
+        entries = self._threads.get(thread_id)
+        if not entries:
+            return None
+        key = normalize_question(user_message)
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        self._threads.move_to_end(thread_id)
+        return response
+
+    def put(self, thread_id: str, user_message: str, response: Any) -> None:
+        """Cache response as the answer to user_message in this thread."""
+        key = normalize_question(user_message)
+        if not key:
+            return
+        entries = self._threads.get(thread_id)
+        if entries is None:
+            entries = OrderedDict()
+            self._threads[thread_id] = entries
+        entries.pop(key, None)
+        entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        while len(entries) > self.entries_per_thread:
+            entries.popitem(last=False)
+        self._threads.move_to_end(thread_id)
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop every cached response of a thread."""
+        self._threads.pop(thread_id, None)
+
+
+# Singleton instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,160 @@
+"""
+Thread Store - async key/value storage for serialized conversation threads.
+
+The supervisor keeps, per thread_id, the serialized state of the shared agent
+thread and of its own routing-only thread. This module provides:
+- ThreadStore protocol (async get/set/delete with TTL, and close)
+- InMemoryThreadStore for single-process deployments (TTL + bounded LRU)
+- RedisThreadStore so several workers/pods can share conversation state
+
+Both stores keep thread state as zlib-compressed JSON bytes.
+"""
+
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from opentelemetry import metrics
+
+from app.config.settings import settings
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_evictions_counter = metrics.get_meter(__name__).create_counter(
+    name="thread_store_evictions_total",
+    description="Threads evicted from the in-memory thread store by the LRU size cap",
+    unit="1",
+)
+
+# Thread store configuration
+TTL_SECONDS = 3600  # Drop threads idle for more than 1 hour
+MAX_ENTRIES = 10_000  # In-memory LRU cap on resident threads
+KEY_PREFIX = "thread:"
+COMPRESSION_LEVEL = 3  # Fast zlib level; thread state is highly repetitive JSON
+
+
+def _pack(state: Dict[str, Any]) -> bytes:
+    """Encode thread state as compact, compressed JSON bytes."""
+    return zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def _unpack(blob: bytes) -> Dict[str, Any]:
+    """Decode bytes produced by _pack back into thread state."""
+    return json.loads(zlib.decompress(blob))
+
+
+class ThreadStore(Protocol):
+    """Async storage for serialized thread state keyed by thread_id."""
+
+    async def get(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def set(self, thread_id: str, blob: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store thread state; ttl defaults to the store's own ttl_seconds."""
+        ...
+
+    async def delete(self, thread_id: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        """Release the store's connections (called on application shutdown)."""
+        ...
+
+
+class InMemoryThreadStore:
+    """Process-local thread store with TTL expiry and a bounded LRU size."""
+
+    def __init__(self, ttl_seconds: int = TTL_SECONDS, max_entries: int = MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(thread_id)
+        if entry is None:
+            return None
+        expires_at, blob = entry
+        if expires_at < time.monotonic():
+            del self._entries[thread_id]
+            return None
+        self._entries.move_to_end(thread_id)
+        return _unpack(blob)
+
+    async def set(self, thread_id: str, blob: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        self._entries[thread_id] = (time.monotonic() + (ttl or self.ttl_seconds), _pack(blob))
+        self._entries.move_to_end(thread_id)
+        while len(self._entries) > self.max_entries:
+            evicted_id, _ = self._entries.popitem(last=False)
+            _evictions_counter.add(1)
+            logger.debug("Evicted least recently used thread %s from thread store", evicted_id)
+
+    async def delete(self, thread_id: str) -> None:
+        self._entries.pop(thread_id, None)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisThreadStore:
+    """Redis-backed thread store shared across worker processes."""
+
+    def __init__(self, redis_url: str, ttl_seconds: int = TTL_SECONDS):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package is not installed; cannot use RedisThreadStore")
+        self.ttl_seconds = ttl_seconds
+        self.client = redis.from_url(redis_url)
+
+    async def get(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(KEY_PREFIX + thread_id)
+        if raw is None:
+            return None
+        return _unpack(raw)
+
+    async def set(self, thread_id: str, blob: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        await self.client.set(KEY_PREFIX + thread_id, _pack(blob), ex=ttl or self.ttl_seconds)
+
+    async def delete(self, thread_id: str) -> None:
+        await self.client.delete(KEY_PREFIX + thread_id)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+# Singleton instance
+_thread_store: Optional[ThreadStore] = None
+
+
+def get_thread_store() -> ThreadStore:
+    """Get or create the process-wide thread store configured in settings."""
+    global _thread_store
+    if _thread_store is None:
+        if settings.THREAD_STORE_REDIS_URL and REDIS_AVAILABLE:
+            _thread_store = RedisThreadStore(
+                settings.THREAD_STORE_REDIS_URL, settings.THREAD_STORE_TTL_SECONDS
+            )
+            logger.info("Using Redis thread store")
+        else:
+            if settings.THREAD_STORE_REDIS_URL:
+                logger.warning("Redis not available, using in-memory thread store")
+            _thread_store = InMemoryThreadStore(
+                settings.THREAD_STORE_TTL_SECONDS, settings.THREAD_STORE_MAX_ENTRIES
+            )
+    return _thread_store
+
+
+async def close_thread_store() -> None:
+    """Close the process-wide thread store, if one was created."""
+    global _thread_store
+    if _thread_store is not None:
+        store, _thread_store = _thread_store, None
+        await store.close()
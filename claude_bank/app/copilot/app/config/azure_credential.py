@@ -1,34 +1,87 @@
+import asyncio
 import os
+import time
+from typing import Any, Dict, FrozenSet, Optional
+from azure.core.credentials import AccessToken
 from azure.identity import ManagedIdentityCredential, AzureCliCredential
 from azure.identity.aio import ManagedIdentityCredential as AioManagedIdentityCredential, AzureCliCredential as AioCliCredential
 from app.config.settings import settings
 
+# Tokens are refreshed this long before they expire, so no request is sent with a token about to lapse
+TOKEN_REFRESH_MARGIN_SECONDS = 30
+
+
+class CachedTokenCredential:
+    """
+    Async credential that serves each scope's access token from memory until shortly before it expires.
+
+    Concurrent callers that find the token stale share one refresh. Requests with extra
+    arguments (claims challenges, tenant overrides) always go to the wrapped credential.
+    """
+
+    def __init__(self, inner: Any):
+        self._inner = inner
+        self._tokens: Dict[FrozenSet[str], AccessToken] = {}
+        self._lock = asyncio.Lock()
+
+    def _fresh(self, key: FrozenSet[str]) -> Optional[AccessToken]:
+        token = self._tokens.get(key)
+        if token is not None and token.expires_on - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+            return token
+        return None
+
+    async def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        if kwargs:
+            return await self._inner.get_token(*scopes, **kwargs)
+        key = frozenset(scopes)
+        token = self._fresh(key)
+        if token is not None:
+            return token
+        async with self._lock:
+            token = self._fresh(key)
+            if token is None:
+                token = await self._inner.get_token(*scopes)
+                self._tokens[key] = token
+            return token
+
+    async def close(self) -> None:
+        await self._inner.close()
+
+    async def __aenter__(self) -> "CachedTokenCredential":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Shared by the whole process; closed once on shutdown by close_azure_credential_async()
+        return None
+
+
+_shared_async_credential: Optional[CachedTokenCredential] = None
+
+
 async def get_azure_credential_async():
     """
-    Returns an Azure credential asynchronously based on the application environment.
+    Returns the process-wide async Azure credential, with tokens cached until shortly before expiry.
 
+    The underlying credential is created once, based on the application environment.
     Priority order:
     1. Service Principal (if AZURE_CLIENT_ID, AZURE_TENANT_ID, AZURE_CLIENT_SECRET all set)
     2. Azure CLI (if PROFILE='dev' and no service principal)
     3. Managed Identity (production fallback)
 
     Returns:
-        Credential object: Service Principal, CLI, or Managed Identity credential.
+        CachedTokenCredential wrapping a Service Principal, CLI, or Managed Identity credential.
     """
-    # Check if service principal credentials are available (Docker/CI/CD)
-    if (os.getenv('AZURE_CLIENT_ID') and 
-        os.getenv('AZURE_TENANT_ID') and 
-        os.getenv('AZURE_CLIENT_SECRET')):
-        from azure.identity.aio import ClientSecretCredential
-        return ClientSecretCredential(
-            tenant_id=os.getenv('AZURE_TENANT_ID'),
-            client_id=os.getenv('AZURE_CLIENT_ID'),
-            client_secret=os.getenv('AZURE_CLIENT_SECRET')
-        )
-    elif settings.PROFILE == 'dev':
-        return AioCliCredential()  # CodeQL [SM05139] Okay use of DefaultAzureCredential as it is only used in development
-    else:
-        return AioManagedIdentityCredential(client_id=settings.AZURE_CLIENT_ID)
+    global _shared_async_credential
+    if _shared_async_credential is None:
+        _shared_async_credential = CachedTokenCredential(get_async_azure_credential())
+    return _shared_async_credential
+
+async def close_azure_credential_async():
+    """Close the process-wide async credential; call on application shutdown."""
+    global _shared_async_credential
+    if _shared_async_credential is not None:
+        await _shared_async_credential.close()
+        _shared_async_credential = None
 
 def get_async_azure_credential():
     """
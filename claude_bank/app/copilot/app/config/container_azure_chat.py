@@ -109,8 +109,8 @@ class Container(containers.DeclarativeContainer):
         escalation_comms_agent=escalation_comms_agent
     )
 
-    #Supervisor Agent with Azure chat based agents. A per request instance is created as it holds the thread state
-    supervisor_agent = providers.Factory(
+    #Supervisor Agent with Azure chat based agents. Can be singleton as per-request state is kept in a ContextVar and thread state in the thread store
+    supervisor_agent = providers.Singleton(
         SupervisorAgent,
         azure_chat_client=_azure_chat_client,
         account_agent=account_agent,
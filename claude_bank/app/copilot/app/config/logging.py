@@ -1,6 +1,9 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -115,6 +118,53 @@ def _setup_azure_monitoring_logging() -> None:
     logger = logging.getLogger()
     logger.addHandler(handler)
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message and traceback formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record can be enqueued as-is instead of pre-formatted
+        return record
+
+
+_queue_listeners: list[logging.handlers.QueueListener] = []
+
+
+def _enable_queued_handlers() -> None:
+    """Move configured handlers behind queues so log I/O runs on background threads.
+
+    Every distinct handler gets its own queue and listener thread, and is replaced by a
+    QueueHandler on each logger that used it, so per-logger handler routing is unchanged.
+    """
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+
+    queued: Dict[logging.Handler, logging.Handler] = {}
+    for logger in loggers:
+        for index, handler in enumerate(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                continue
+            if handler not in queued:
+                handler_queue: queue.Queue = queue.Queue(-1)
+                queue_handler = _DeferredQueueHandler(handler_queue)
+                queue_handler.setLevel(handler.level)
+                listener = logging.handlers.QueueListener(handler_queue, handler, respect_handler_level=True)
+                listener.start()
+                _queue_listeners.append(listener)
+                queued[handler] = queue_handler
+            logger.handlers[index] = queued[handler]
+
+
+def _stop_queue_listeners() -> None:
+    """Flush queued records and stop listener threads."""
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(_stop_queue_listeners)
+
+
 def setup_logging(profile: Optional[str] = None) -> None:
     """Setup logging configuration based on the profile.
     
@@ -127,7 +177,10 @@ def setup_logging(profile: Optional[str] = None) -> None:
     config = load_logging_config(config_path)
     
     try:
+        _stop_queue_listeners()
         logging.config.dictConfig(config)
+        # Request handlers only enqueue records; formatting and stdout/file writes happen off the event loop
+        _enable_queued_handlers()
         if config_path:
             print(f"Logging configured from: {config_path}")
         else:
@@ -54,6 +54,7 @@ class Settings(BaseSettings):
     AZURE_OPENAI_ENDPOINT: str | None = Field(default=None)
     AZURE_OPENAI_CHAT_DEPLOYMENT_NAME: str = Field(default="gpt-4o")
     AZURE_OPENAI_MINI_DEPLOYMENT_NAME: str = Field(default="gpt-4.1-mini")  # For cache formatting
+    AZURE_OPENAI_MAX_CONCURRENCY: int = Field(default=16, description="Max concurrent sub-agent runs against Azure OpenAI per process")
     
     # OpenTelemetry configuration
     OTEL_RESOURCE_ATTRIBUTES: str = Field(default="service.name=Copilot Multi Agent Chat API,service.version=1.0.0")
@@ -150,6 +151,11 @@ class Settings(BaseSettings):
     AZURE_AI_PROJECT_ENDPOINT: str | None = Field(default=None, description="Azure AI Foundry V2 project endpoint (for A2A agents)")
     AZURE_AI_PROJECT_API_KEY: str | None = Field(default=None, description="Azure AI Foundry V2 API key (for A2A agents)")
 
+    # Supervisor conversation thread store
+    THREAD_STORE_REDIS_URL: str | None = Field(default=None, description="Redis URL for shared supervisor thread state (in-memory store when unset)")
+    THREAD_STORE_TTL_SECONDS: int = Field(default=3600, description="Seconds a conversation thread is kept after its last turn")
+    THREAD_STORE_MAX_ENTRIES: int = Field(default=10_000, description="Max threads kept by the in-memory thread store before LRU eviction")
+
     model_config = SettingsConfigDict(
         env_file=get_env_files(),
         env_file_encoding="utf-8",
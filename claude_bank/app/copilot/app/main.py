@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth_routers, chat_routers, content_routers, dashboard_routers, agent_cards_routers, mcp_routers
 from app.config.settings import settings
@@ -106,36 +106,57 @@ def create_app() -> FastAPI:
                               settings.USE_A2A_FOR_TRANSACTION_AGENT and 
                               settings.USE_A2A_FOR_PAYMENT_AGENT)
         
-        if not _a2a_mode_enabled:
-            # TRADITIONAL MODE: Pre-warm in-process agents
-            logger.info("⚡ Pre-warming agent cache (Traditional mode)...")
+        # Readiness is reported by /healthz/ready; it stays 503 until pre-warming has finished
+        app.state.agents_ready = False
+
+        async def prewarm_agents():
+            """Build agents ahead of the first request, then mark the app ready."""
             try:
                 supervisor = container.supervisor_agent()
-                
-                # Build supervisor agent (will be cached as Singleton)
-                logger.info("Building Supervisor agent...")
-                await supervisor._build_af_agent(thread_id=None, user_context=None)
-                logger.info("✅ Supervisor agent cached")
-                
-                # Build AI Money Coach agent (slowest - 30s)
-                logger.info("Building AI Money Coach agent...")
-                ai_money_coach = container._foundry_ai_money_coach_agent()
-                await ai_money_coach.build_af_agent(thread_id=None)
-                logger.info("✅ AI Money Coach agent cached")
-                
-                # Build ProdInfo FAQ agent
-                logger.info("Building ProdInfo FAQ agent...")
-                prodinfo_faq = container._foundry_prodinfo_faq_agent()
-                await prodinfo_faq.build_af_agent(thread_id=None)
-                logger.info("✅ ProdInfo FAQ agent cached")
+
+                if hasattr(supervisor, "prewarm"):
+                    # Azure Chat supervisor builds itself and all of its sub-agents
+                    await supervisor.prewarm()
+                else:
+                    # Build supervisor agent (will be cached as Singleton)
+                    logger.info("Building Supervisor agent...")
+                    await supervisor._build_af_agent(thread_id=None, user_context=None)
+                    logger.info("✅ Supervisor agent cached")
+                    
+                    # Build the Foundry sub-agents concurrently so startup waits for the
+                    # slowest one (AI Money Coach, ~30s) rather than the sum of all
+                    sub_agents = {
+                        "AI Money Coach": container._foundry_ai_money_coach_agent,
+                        "EscalationComms": container._foundry_escalation_comms_agent,
+                        "ProdInfo FAQ": container._foundry_prodinfo_faq_agent,
+                    }
+                    logger.info("Building %s agents concurrently...", ", ".join(sub_agents))
+                    results = await asyncio.gather(
+                        *(provider().build_af_agent(thread_id=None) for provider in sub_agents.values()),
+                        return_exceptions=True,
+                    )
+                    for label, result in zip(sub_agents, results):
+                        if isinstance(result, BaseException):
+                            logger.warning("⚠️ %s agent pre-warming failed (will build on first use): %s", label, result)
+                        else:
+                            logger.info("✅ %s agent cached", label)
                 
                 logger.info("🎉 Agent cache pre-warming complete! First request will be fast.")
             except Exception as e:
                 logger.warning(f"⚠️ Agent pre-warming failed (agents will build on first use): {e}")
+            finally:
+                app.state.agents_ready = True
+
+        if not _a2a_mode_enabled:
+            # TRADITIONAL MODE: Pre-warm in-process agents in the background; the server accepts
+            # connections meanwhile and /healthz/ready keeps load balancers away until it is done
+            logger.info("⚡ Pre-warming agent cache (Traditional mode)...")
+            app.state.prewarm_task = asyncio.create_task(prewarm_agents())
         else:
             # A2A MODE: Skip pre-warming, agents run standalone
             logger.info("🚀 A2A MODE: Skipping agent pre-warming (agents run standalone on ports 9001-9006)")
             logger.info("   → Make sure standalone A2A agents are running before making requests")
+            app.state.agents_ready = True
         
         try:
             from pathlib import Path
@@ -227,6 +248,10 @@ def create_app() -> FastAPI:
         # Shutdown
         logger.info("Shutting down application...")
         
+        # Stop agent pre-warming if it is still running
+        if hasattr(app.state, 'prewarm_task') and not app.state.prewarm_task.done():
+            app.state.prewarm_task.cancel()
+
         # Shutdown cache cleanup task
         try:
             if hasattr(app.state, 'cache_cleanup_task'):
@@ -234,7 +259,47 @@ def create_app() -> FastAPI:
                 logger.info("✅ Cache cleanup task stopped")
         except Exception as e:
             logger.error(f"❌ Error stopping cache cleanup task: {e}")
-        
+
+        # Flush background log queues (e.g. routing decisions) before their loop goes away
+        try:
+            from app.utils.background_log import close_background_logs
+            await close_background_logs()
+            logger.info("✅ Background log queues flushed")
+        except Exception as e:
+            logger.error(f"❌ Error flushing background log queues: {e}")
+
+        # Shutdown pooled MCP tools and their heartbeats
+        try:
+            from app.tools.mcp_tool_registry import get_mcp_tool_registry
+            await get_mcp_tool_registry().close()
+            logger.info("✅ MCP tool registry closed")
+        except Exception as e:
+            logger.error(f"❌ Error closing MCP tool registry: {e}")
+
+        # Shutdown the conversation thread store (closes the Redis connection pool if used)
+        try:
+            from app.cache.thread_store import close_thread_store
+            await close_thread_store()
+            logger.info("✅ Thread store closed")
+        except Exception as e:
+            logger.error(f"❌ Error closing thread store: {e}")
+
+        # Shutdown shared HTTP connection pools
+        try:
+            from app.utils.http_client import close_shared_http_clients
+            await close_shared_http_clients()
+            logger.info("✅ Shared HTTP clients closed")
+        except Exception as e:
+            logger.error(f"❌ Error closing shared HTTP clients: {e}")
+
+        # Shutdown the shared Azure credential
+        try:
+            from app.config.azure_credential import close_azure_credential_async
+            await close_azure_credential_async()
+            logger.info("✅ Azure credential closed")
+        except Exception as e:
+            logger.error(f"❌ Error closing Azure credential: {e}")
+
         # Shutdown session memory manager
         try:
             session_manager = get_session_manager()
@@ -269,6 +334,14 @@ def create_app() -> FastAPI:
 
     app.router.lifespan_context = lifespan
 
+    @app.get("/healthz/ready", tags=["health"])
+    async def readiness(response: Response):
+        """Readiness probe: 503 until agent pre-warming has completed."""
+        if not getattr(app.state, "agents_ready", False):
+            response.status_code = 503
+            return {"status": "starting"}
+        return {"status": "ready"}
+
     # Include routers
     app.include_router(auth_routers.router, prefix="/api", tags=["auth"])
     app.include_router(chat_routers.router, prefix="/api", tags=["chat"])
@@ -6,19 +6,105 @@ for compliance tracking when MCP tools are invoked by Azure AI Foundry agents.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional, Tuple
+import httpx
 from agent_framework import MCPStreamableHTTPTool
 from app.observability.banking_telemetry import get_banking_telemetry
+from app.utils.http_client import get_shared_mcp_http_client
 
 logger = logging.getLogger(__name__)
 
+# Tool schemas (list_tools results) rarely change, so share them per MCP URL
+TOOL_SCHEMA_TTL_SECONDS = 300.0
+_tool_schema_cache: Dict[str, Tuple[float, Any]] = {}
+
+# Per-request audit context. A pooled tool can serve many customers at once, so
+# the request's identity travels with the asyncio task instead of the tool;
+# tasks spawned while handling the request inherit it.
+CUSTOMER_ID: ContextVar[Optional[str]] = ContextVar("customer_id", default=None)
+THREAD_ID: ContextVar[Optional[str]] = ContextVar("thread_id", default=None)
+_THREAD_CONTEXT: ContextVar[Any] = ContextVar("thread_context", default=None)
+
+
+def set_audit_context(customer_id: Optional[str], thread_id: Optional[str]) -> Tuple[Token, Token, Token]:
+    """Set the customer and thread recorded for MCP calls in the current request.
+
+    Also clears the thread object set by AuditedMCPTool.set_thread_context, so
+    it never carries over from an earlier request. Returns the tokens to pass
+    to reset_audit_context once the request is done.
+    """
+    return CUSTOMER_ID.set(customer_id), THREAD_ID.set(thread_id), _THREAD_CONTEXT.set(None)
+
+
+def reset_audit_context(tokens: Tuple[Token, Token, Token]) -> None:
+    """Restore the audit context that was in effect before set_audit_context.
+
+    This includes any thread set with set_thread_context in the meantime.
+    """
+    customer_token, thread_token, thread_context_token = tokens
+    _THREAD_CONTEXT.reset(thread_context_token)
+    THREAD_ID.reset(thread_token)
+    CUSTOMER_ID.reset(customer_token)
+
+
+@contextmanager
+def audit_context(customer_id: Optional[str], thread_id: Optional[str]) -> Iterator[None]:
+    """Record MCP calls made inside the block against customer_id and thread_id."""
+    tokens = set_audit_context(customer_id, thread_id)
+    try:
+        yield
+    finally:
+        reset_audit_context(tokens)
+
+
+class _BorrowedHTTPClient:
+    """Lends the shared client to one MCP connection; the transport's `async with` must not close it."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        return self._client
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+def shared_mcp_http_client_factory(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+):
+    """httpx_client_factory for the MCP transport that reuses the process-wide MCP client.
+
+    The transport sends its headers with every request and the shared client
+    carries the transport's default timeouts, so every connection can share one
+    pool. A connection that needs its own auth gets a dedicated client.
+    """
+    if auth is not None:
+        return httpx.AsyncClient(headers=headers, timeout=timeout, auth=auth, follow_redirects=True)
+    return _BorrowedHTTPClient(get_shared_mcp_http_client())
+
+
+def invalidate_tool_schema_cache(url: Optional[str] = None) -> None:
+    """Drop cached tool schemas for one MCP URL, or for all of them."""
+    if url is None:
+        _tool_schema_cache.clear()
+    else:
+        _tool_schema_cache.pop(url, None)
+
 
 class AuditedMCPTool(MCPStreamableHTTPTool):
     """
     Wrapper around MCPStreamableHTTPTool that adds audit logging.
     
     This wrapper intercepts MCP tool calls and logs them for compliance purposes
-    (GDPR, PCI-DSS). It tracks:
+    (GDPR, PCI-DSS). The customer and thread come from the request's audit
+    context (set_audit_context), falling back to the values given at
+    construction. It tracks:
     - Which tool was called
     - By which user (customer_id)
     - What data was accessed
@@ -40,25 +126,67 @@ class AuditedMCPTool(MCPStreamableHTTPTool):
         Args:
             name: Tool name (e.g., "Account MCP server client")
             url: MCP server URL
-            customer_id: Customer ID for audit tracking
-            thread_id: Thread ID for audit tracking
+            customer_id: Fallback customer ID for audit tracking
+            thread_id: Fallback thread ID for audit tracking
             mcp_server_name: Friendly name (e.g., "account", "transaction")
         """
-        super().__init__(name=name, url=url)
+        # Connections share one pooled httpx client instead of opening one each
+        super().__init__(name=name, url=url, httpx_client_factory=shared_mcp_http_client_factory)
         self.customer_id = customer_id
         self.thread_id = thread_id
         self.mcp_server_name = mcp_server_name or self._extract_server_name(url)
         self.telemetry = get_banking_telemetry()
-        self._thread_context = None  # Will be set by agent
         
         logger.debug(
             f"Created audited MCP tool: {name} "
             f"(server={self.mcp_server_name}, customer={customer_id})"
         )
     
-    def set_thread_context(self, thread):
-        """Set thread context to extract actual thread_id during execution."""
-        self._thread_context = thread
+    async def load_tools(self) -> None:
+        """
+        Load tool functions, serving list_tools from the per-URL schema cache.
+
+        Every new connection (per customer, or after a heartbeat reconnect)
+        would otherwise repeat the list_tools round trip for schemas that are
+        identical across connections to the same server.
+        """
+        session = getattr(self, "session", None)
+        if session is None:
+            return await super().load_tools()
+
+        entry = _tool_schema_cache.get(self.url)
+        cached = entry[1] if entry and time.monotonic() - entry[0] < TOOL_SCHEMA_TTL_SECONDS else None
+        fetch = session.list_tools
+
+        async def list_tools(*args, **kwargs):
+            # Only the unpaginated call is cacheable
+            if args or kwargs:
+                return await fetch(*args, **kwargs)
+            if cached is not None:
+                return cached
+            result = await fetch()
+            if not getattr(result, "nextCursor", None):
+                _tool_schema_cache[self.url] = (time.monotonic(), result)
+            return result
+
+        session.list_tools = list_tools
+        try:
+            await super().load_tools()
+        except Exception:
+            invalidate_tool_schema_cache(self.url)
+            raise
+        finally:
+            del session.list_tools
+
+    def set_thread_context(self, thread) -> Token:
+        """Set thread context to extract actual thread_id during execution.
+
+        Scoped to the current request context, so callers sharing a pooled
+        tool never see each other's thread. The enclosing audit_context
+        restores the previous value on exit; outside one, pass the returned
+        token to _THREAD_CONTEXT.reset().
+        """
+        return _THREAD_CONTEXT.set(thread)
     
     def _extract_server_name(self, url: str) -> str:
         """Extract server name from URL for audit logging."""
@@ -105,14 +233,17 @@ class AuditedMCPTool(MCPStreamableHTTPTool):
         audit_logger = get_audit_logger()
         start_time = time.perf_counter()
         
+        customer_id = CUSTOMER_ID.get() or self.customer_id
+        
         # Try to get thread_id from multiple sources:
-        # 1. From _thread_context (if set via set_thread_context)
+        # 1. From the thread context (if set via set_thread_context)
         # 2. From the call stack (agent's thread context)
-        # 3. Fall back to self.thread_id (initial value)
-        actual_thread_id = self.thread_id
+        # 3. Fall back to the request's audit context, then self.thread_id
+        actual_thread_id = THREAD_ID.get() or self.thread_id
+        thread_context = _THREAD_CONTEXT.get()
         
-        if self._thread_context and hasattr(self._thread_context, 'service_thread_id'):
-            actual_thread_id = self._thread_context.service_thread_id
+        if thread_context and hasattr(thread_context, 'service_thread_id'):
+            actual_thread_id = thread_context.service_thread_id
             logger.info(f"🔍 Thread ID from context: {actual_thread_id}")
         else:
             # Try to find thread_id from call stack
@@ -128,7 +259,7 @@ class AuditedMCPTool(MCPStreamableHTTPTool):
         
         logger.info(
             f"🔧 MCP Tool Call: {tool_name} on {self.mcp_server_name} "
-            f"(customer={self.customer_id}, thread={actual_thread_id})"
+            f"(customer={customer_id}, thread={actual_thread_id})"
         )
         
         # Determine operation type based on tool name
@@ -139,7 +270,7 @@ class AuditedMCPTool(MCPStreamableHTTPTool):
             operation_type=operation_type,
             mcp_server=self.mcp_server_name,
             tool_name=tool_name,
-            user_id=self.customer_id or "unknown",
+            user_id=customer_id or "unknown",
             thread_id=actual_thread_id,
             parameters=arguments
         ) as audit:
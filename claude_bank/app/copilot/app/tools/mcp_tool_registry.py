@@ -0,0 +1,241 @@
+"""
+MCP Tool Registry - process-wide pool of connected MCP tools.
+
+Agents used to create and connect a fresh MCPStreamableHTTPTool on every
+build_af_agent call. This module keeps one connected tool per (name, url)
+and monitors it with a background heartbeat, so a stale connection is
+recycled out-of-band instead of failing the first user request after an
+MCP server outage. A tool not confirmed alive within the liveness threshold
+is pinged before it is handed out, and reconnected if the ping fails.
+Tools nobody has used within the idle TTL are closed and dropped, so
+per-customer pools do not grow without bound. Callers that hold on to a tool
+(e.g. inside a cached ChatAgent) report each reuse with touch().
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from agent_framework import MCPStreamableHTTPTool
+
+logger = logging.getLogger(__name__)
+
+# Heartbeat configuration
+HEARTBEAT_INTERVAL_SECONDS = 30.0
+
+# A pooled tool not confirmed alive within this window is pinged before reuse
+LIVENESS_THRESHOLD_SECONDS = 30.0
+
+# A pooled tool neither handed out by get() nor reported by touch() for this
+# long is closed by its heartbeat. Agent caches that keep a tool for longer
+# than this must touch() it on every reuse.
+IDLE_TTL_SECONDS = 3600.0
+
+# Per-customer pools mean a traffic burst can open many connections to one
+# server at once; cap concurrent connect handshakes per URL
+MAX_CONCURRENT_CONNECTS_PER_URL = 4
+
+ToolKey = Tuple[str, str]
+
+
+class MCPToolRegistry:
+    """Pools connected MCP tools and keeps them healthy with a heartbeat."""
+
+    def __init__(
+        self,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SECONDS,
+        liveness_threshold: float = LIVENESS_THRESHOLD_SECONDS,
+        idle_ttl: float = IDLE_TTL_SECONDS,
+        max_concurrent_connects: int = MAX_CONCURRENT_CONNECTS_PER_URL,
+    ):
+        self.heartbeat_interval = heartbeat_interval
+        self.liveness_threshold = liveness_threshold
+        self.idle_ttl = idle_ttl
+        self.max_concurrent_connects = max_concurrent_connects
+        self._tools: Dict[ToolKey, MCPStreamableHTTPTool] = {}
+        self._keys: Dict[int, ToolKey] = {}  # id(pooled tool) -> its key, for touch()
+        self._healthy: Dict[ToolKey, bool] = {}
+        self._last_alive: Dict[ToolKey, float] = {}
+        self._last_used: Dict[ToolKey, float] = {}
+        self._heartbeats: Dict[ToolKey, asyncio.Task] = {}
+        self._locks: Dict[ToolKey, asyncio.Lock] = {}
+        self._connect_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def get(
+        self,
+        name: str,
+        url: str,
+        factory: Optional[Callable[[], MCPStreamableHTTPTool]] = None,
+    ) -> MCPStreamableHTTPTool:
+        """
+        Return a connected MCP tool for (name, url), connecting on first use.
+
+        Args:
+            name: Tool name (e.g., "Account MCP server client")
+            url: MCP server URL
+            factory: Optional callable building an unconnected tool;
+                defaults to MCPStreamableHTTPTool(name=name, url=url)
+
+        Returns:
+            A connected tool shared by every caller with the same key
+        """
+        key = (name, url)
+        self._last_used[key] = time.monotonic()
+        tool = self._tools.get(key)
+        if tool is not None and self._healthy.get(key) and await self._is_alive(key, tool):
+            return tool
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            stale = self._tools.get(key)
+            if stale is not None and self._healthy.get(key):
+                return stale
+
+            tool = await self._connect(name, url, factory)
+            self._put(key, tool)
+            self._healthy[key] = True
+            self._last_alive[key] = time.monotonic()
+            if stale is not None:
+                await self._close_quietly(stale)
+            if key not in self._heartbeats:
+                self._heartbeats[key] = asyncio.create_task(
+                    self._heartbeat(key, factory)
+                )
+            return tool
+
+    def touch(self, tool: MCPStreamableHTTPTool) -> None:
+        """Record a use of a pooled tool by a caller that kept it, so it is not closed as idle."""
+        key = self._keys.get(id(tool))
+        if key is not None and self._tools.get(key) is tool:
+            self._last_used[key] = time.monotonic()
+
+    def _put(self, key: ToolKey, tool: MCPStreamableHTTPTool) -> None:
+        previous = self._tools.get(key)
+        if previous is not None:
+            self._keys.pop(id(previous), None)
+        self._tools[key] = tool
+        self._keys[id(tool)] = key
+
+    async def _connect(
+        self,
+        name: str,
+        url: str,
+        factory: Optional[Callable[[], MCPStreamableHTTPTool]],
+    ) -> MCPStreamableHTTPTool:
+        tool = factory() if factory else MCPStreamableHTTPTool(name=name, url=url)
+        semaphore = self._connect_semaphores.setdefault(
+            url, asyncio.Semaphore(self.max_concurrent_connects)
+        )
+        async with semaphore:
+            await tool.connect()
+        logger.debug("Connected MCP tool %s at %s", name, url)
+        return tool
+
+    async def _is_alive(self, key: ToolKey, tool: MCPStreamableHTTPTool) -> bool:
+        """Ping the tool if it has not been confirmed alive recently."""
+        if time.monotonic() - self._last_alive.get(key, 0.0) < self.liveness_threshold:
+            return True
+        try:
+            await self._ping(tool)
+        except Exception as e:
+            self._healthy[key] = False
+            logger.warning("MCP liveness check failed for %s at %s: %s", key[0], key[1], e)
+            return False
+        self._last_alive[key] = time.monotonic()
+        return True
+
+    async def _close_quietly(self, tool: MCPStreamableHTTPTool) -> None:
+        try:
+            await tool.close()
+        except Exception as e:
+            logger.debug("Ignoring error closing stale MCP tool %s: %s", tool.name, e)
+
+    async def _ping(self, tool: MCPStreamableHTTPTool) -> None:
+        session = getattr(tool, "session", None)
+        if session is None:
+            raise ConnectionError(f"MCP tool {tool.name} has no active session")
+        await session.send_ping()
+
+    async def _heartbeat(
+        self,
+        key: ToolKey,
+        factory: Optional[Callable[[], MCPStreamableHTTPTool]],
+    ) -> None:
+        """Ping the pooled tool periodically and reconnect it out-of-band."""
+        name, url = key
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            tool = self._tools.get(key)
+            if tool is None:
+                return
+            if time.monotonic() - self._last_used.get(key, 0.0) >= self.idle_ttl:
+                self._evict(key)
+                logger.info("Closing idle MCP tool %s at %s", name, url)
+                await self._close_quietly(tool)
+                return
+            try:
+                await self._ping(tool)
+                self._healthy[key] = True
+                self._last_alive[key] = time.monotonic()
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._healthy[key] = False
+                logger.warning("MCP heartbeat failed for %s at %s: %s", name, url, e)
+
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                if self._tools.get(key) is not tool:
+                    # A caller already reconnected it after a failed liveness check
+                    continue
+                try:
+                    replacement = await self._connect(name, url, factory)
+                except Exception as e:
+                    logger.warning("MCP reconnect failed for %s at %s: %s", name, url, e)
+                    continue
+
+                self._put(key, replacement)
+                self._healthy[key] = True
+                self._last_alive[key] = time.monotonic()
+            logger.info("Reconnected MCP tool %s at %s", name, url)
+            await self._close_quietly(tool)
+
+    def _evict(self, key: ToolKey) -> None:
+        """Forget a pooled tool; the next get() for its key reconnects."""
+        tool = self._tools.pop(key, None)
+        if tool is not None:
+            self._keys.pop(id(tool), None)
+        self._healthy.pop(key, None)
+        self._last_alive.pop(key, None)
+        self._last_used.pop(key, None)
+        self._heartbeats.pop(key, None)
+        self._locks.pop(key, None)
+
+    async def close(self) -> None:
+        """Stop all heartbeats and close every pooled tool."""
+        for task in self._heartbeats.values():
+            task.cancel()
+        self._heartbeats.clear()
+        for (name, _url), tool in list(self._tools.items()):
+            try:
+                await tool.close()
+            except Exception as e:
+                logger.debug("Ignoring error closing MCP tool %s: %s", name, e)
+        self._tools.clear()
+        self._keys.clear()
+        self._healthy.clear()
+        self._last_alive.clear()
+        self._last_used.clear()
+
+
+# Global registry instance
+_mcp_tool_registry: Optional[MCPToolRegistry] = None
+
+
+def get_mcp_tool_registry() -> MCPToolRegistry:
+    """Get or create the global MCP tool registry."""
+    global _mcp_tool_registry
+    if _mcp_tool_registry is None:
+        _mcp_tool_registry = MCPToolRegistry()
+    return _mcp_tool_registry
@@ -0,0 +1,117 @@
+"""
+Background Log Queue - moves structured log writes off the request path.
+
+Request handlers call emit(), which only enqueues the event. A single
+background task drains the queue and writes events to the logger in
+batches, so a slow log handler or exporter never adds latency to a request.
+When the queue is full the oldest event is dropped. The application
+shutdown calls close_background_logs() to flush every queue.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Queue configuration
+MAX_QUEUE_SIZE = 10_000
+MAX_BATCH_SIZE = 100
+BATCH_WAIT_SECONDS = 0.05
+CLOSE_TIMEOUT_SECONDS = 5.0
+
+# Enqueued by close(): the drain task writes its current batch and exits
+_STOP = object()
+
+# Every live queue, so shutdown can flush them without importing their owners
+_QUEUES: "weakref.WeakSet[BackgroundLogQueue]" = weakref.WeakSet()
+
+
+class BackgroundLogQueue:
+    """Batches structured events and writes them from a background task."""
+
+    def __init__(
+        self,
+        target: logging.Logger,
+        level: int = logging.INFO,
+        maxsize: int = MAX_QUEUE_SIZE,
+        batch_size: int = MAX_BATCH_SIZE,
+        batch_wait: float = BATCH_WAIT_SECONDS,
+    ):
+        self.target = target
+        self.level = level
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        _QUEUES.add(self)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Enqueue an event without blocking; drops the oldest event when full."""
+        if not self.target.isEnabledFor(self.level):
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+    async def _drain(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[Dict[str, Any]] = [item]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), self.batch_wait)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.target.log(self.level, json.dumps({"batch": batch}, default=str))
+        except Exception as e:
+            logger.debug("Failed to write background log batch: %s", e)
+
+    async def close(self, timeout: float = CLOSE_TIMEOUT_SECONDS) -> None:
+        """Flush pending events, including the batch being drained, and stop the background task."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            # The drain task writes everything queued ahead of the stop marker, then exits
+            await self._queue.put(_STOP)
+            try:
+                await asyncio.wait_for(task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Background log queue did not drain within %.1fs", timeout)
+        pending: List[Dict[str, Any]] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        if pending:
+            self._write(pending)
+
+
+async def close_background_logs() -> None:
+    """Flush and stop every background log queue (called on application shutdown)."""
+    for queue in list(_QUEUES):
+        await queue.close()
@@ -0,0 +1,59 @@
+"""
+Shared HTTP clients for agent-to-agent and MCP calls.
+
+Creating an httpx.AsyncClient per call pays a TCP + TLS handshake every time.
+This module keeps one pooled client per event loop (httpx clients must not be
+shared across loops) for all agents in the process, and a second one with
+MCP transport defaults for the MCP tool connections.
+"""
+
+import asyncio
+import logging
+from typing import Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Connection pool configuration
+DEFAULT_TIMEOUT_SECONDS = 30.0
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# MCP streamable HTTP reads server-sent events, so reads may wait as long as the
+# transport's default SSE read timeout
+MCP_TIMEOUT = httpx.Timeout(30.0, read=300.0)
+MCP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+_clients: Dict[int, httpx.AsyncClient] = {}
+_mcp_clients: Dict[int, httpx.AsyncClient] = {}
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled httpx client for the running event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    client = _clients.get(loop_id)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_SECONDS, limits=POOL_LIMITS)
+        _clients[loop_id] = client
+    return client
+
+
+def get_shared_mcp_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled httpx client for MCP connections on the running event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    client = _mcp_clients.get(loop_id)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=MCP_TIMEOUT, limits=MCP_POOL_LIMITS, follow_redirects=True)
+        _mcp_clients[loop_id] = client
+    return client
+
+
+async def close_shared_http_clients() -> None:
+    """Close every pooled client; call on application shutdown."""
+    for client in [*_clients.values(), *_mcp_clients.values()]:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("Ignoring error closing shared HTTP client: %s", e)
+    _clients.clear()
+    _mcp_clients.clear()
@@ -0,0 +1,105 @@
+"""Pytest fixtures for copilot backend unit tests."""
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from agent_framework import BaseChatClient, ChatMessage, ChatResponse, ChatResponseUpdate
+
+from app.agents.azure_chat.supervisor_agent import SupervisorAgent
+from app.cache.response_cache import ResponseCache
+from app.cache.thread_store import InMemoryThreadStore
+
+# The A2A SDK lives in app/a2a-sdk and is deployed as the a2a_sdk package
+# (see the agent Dockerfiles); register it under that name for the tests.
+_A2A_SDK_DIR = Path(__file__).resolve().parents[2] / "a2a-sdk"
+if "a2a_sdk" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "a2a_sdk", _A2A_SDK_DIR / "__init__.py", submodule_search_locations=[str(_A2A_SDK_DIR)]
+    )
+    sys.modules["a2a_sdk"] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules["a2a_sdk"])
+
+
+class RecordingChatClient(BaseChatClient):
+    """Chat client that records the messages of every request and answers with fixed text."""
+
+    def __init__(self, reply: str = "supervisor reply"):
+        super().__init__()
+        self.reply = reply
+        self.requests: list[list[ChatMessage]] = []
+
+    async def _inner_get_response(self, *, messages, chat_options, **kwargs):
+        self.requests.append(list(messages))
+        return ChatResponse(messages=[ChatMessage(role="assistant", text=self.reply)])
+
+    async def _inner_get_streaming_response(self, *, messages, chat_options, **kwargs):
+        self.requests.append(list(messages))
+        yield ChatResponseUpdate(role="assistant", text=self.reply)
+
+
+class FakeSubAgent:
+    """Sub-agent whose ChatAgent records (message, thread) of every run and echoes the message.
+
+    Like a ChatAgent, a run appends the user message and the reply to the thread it was given.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.runs: list[tuple[str, object]] = []
+        self.builds = 0
+
+    async def build_af_agent(self):
+        self.builds += 1
+        return self
+
+    async def run(self, message, thread=None):
+        self.runs.append((message, thread))
+        # Yield so concurrent requests interleave inside the sub-agent run
+        await asyncio.sleep(0.01)
+        reply = f"{self.name}: {message}"
+        await self._record(thread, message, reply)
+        return SimpleNamespace(text=reply)
+
+    async def run_stream(self, message, thread=None):
+        self.runs.append((message, thread))
+        await asyncio.sleep(0.01)
+        reply = f"{self.name}: {message}"
+        yield SimpleNamespace(text=reply)
+        await self._record(thread, message, reply)
+
+    @staticmethod
+    async def _record(thread, message, reply):
+        if thread is not None:
+            await thread.on_new_messages(
+                [ChatMessage(role="user", text=message), ChatMessage(role="assistant", text=reply)]
+            )
+
+
+@pytest.fixture
+def chat_client():
+    return RecordingChatClient()
+
+
+@pytest.fixture
+def sub_agents():
+    return {
+        key: FakeSubAgent(key)
+        for key in ("account", "transaction", "payment", "prodinfo_faq", "ai_money_coach")
+    }
+
+
+@pytest.fixture
+def supervisor(chat_client, sub_agents):
+    return SupervisorAgent(
+        azure_chat_client=chat_client,
+        account_agent=sub_agents["account"],
+        transaction_agent=sub_agents["transaction"],
+        payment_agent=sub_agents["payment"],
+        prodinfo_faq_agent=sub_agents["prodinfo_faq"],
+        ai_money_coach_agent=sub_agents["ai_money_coach"],
+        thread_store=InMemoryThreadStore(),
+        response_cache=ResponseCache(),
+    )
@@ -0,0 +1,74 @@
+"""Tests for the A2A SDK client's retry and circuit breaker handling."""
+import httpx
+import pytest
+
+from a2a_sdk.client.a2a_client import A2AClient, A2AConfig
+from a2a_sdk.utils.circuit_breaker import CircuitBreakerError
+
+ENDPOINT = "http://account/a2a"
+
+
+class FakeRegistryClient:
+    async def discover(self, capability=None, **kwargs):
+        return [{"agent_id": "account-001", "agent_name": "AccountAgent", "endpoints": {"a2a": ENDPOINT}}]
+
+    async def close(self):
+        pass
+
+
+def _client(statuses, **config):
+    """A2AClient whose HTTP calls are answered with the given statuses in turn (last one repeats)."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        status = statuses[min(len(requests), len(statuses)) - 1]
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, json={
+            "correlation_id": "req-1",
+            "source": {"agent_id": "account-001", "agent_name": "AccountAgent"},
+            "target": {"agent_id": "supervisor-001", "agent_name": "SupervisorAgent"},
+            "status": "success",
+        })
+
+    config.setdefault("retry_backoff_seconds", 0)
+    client = A2AClient("supervisor-001", "SupervisorAgent", FakeRegistryClient(), A2AConfig(enable_tracing=False, **config))
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_retried():
+    client, requests = _client([400])
+    try:
+        with pytest.raises(Exception, match="after 1 attempts"):
+            await client.send_message("account", "account.balance", {})
+        assert len(requests) == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_server_error_is_retried():
+    client, requests = _client([503, 200], max_retries=3)
+    try:
+        response = await client.send_message("account", "account.balance", {})
+        assert response.status == "success"
+        assert len(requests) == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_stops_retrying():
+    client, requests = _client([503], max_retries=5, circuit_breaker_threshold=2)
+    try:
+        with pytest.raises(Exception, match="after 2 attempts"):
+            await client.send_message("account", "account.balance", {})
+        assert len(requests) == 2
+        with pytest.raises(CircuitBreakerError):
+            await client.send_message("account", "account.balance", {})
+        assert len(requests) == 2
+    finally:
+        await client.close()
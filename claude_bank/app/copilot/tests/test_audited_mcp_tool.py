@@ -0,0 +1,54 @@
+"""Tests for the audited MCP tool's audit context and shared HTTP client."""
+import asyncio
+
+import pytest
+
+from app.tools.audited_mcp_tool import (
+    _THREAD_CONTEXT,
+    CUSTOMER_ID,
+    THREAD_ID,
+    AuditedMCPTool,
+    audit_context,
+    shared_mcp_http_client_factory,
+)
+from app.utils.http_client import close_shared_http_clients
+
+
+def test_audit_context_is_restored_after_the_block():
+    with audit_context("CUST-001", "thread-1"):
+        assert (CUSTOMER_ID.get(), THREAD_ID.get()) == ("CUST-001", "thread-1")
+        with audit_context("CUST-002", "thread-2"):
+            assert (CUSTOMER_ID.get(), THREAD_ID.get()) == ("CUST-002", "thread-2")
+        assert (CUSTOMER_ID.get(), THREAD_ID.get()) == ("CUST-001", "thread-1")
+    assert (CUSTOMER_ID.get(), THREAD_ID.get()) == (None, None)
+
+
+def test_thread_context_is_reset_with_the_audit_context():
+    tool = AuditedMCPTool(name="Account MCP server client", url="http://account", mcp_server_name="account")
+    thread = object()
+    with audit_context("CUST-001", "thread-1"):
+        tool.set_thread_context(thread)
+        assert _THREAD_CONTEXT.get() is thread
+    assert _THREAD_CONTEXT.get() is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_their_own_audit_context():
+    async def request(customer_id, thread_id):
+        with audit_context(customer_id, thread_id):
+            await asyncio.sleep(0.01)
+            return CUSTOMER_ID.get(), THREAD_ID.get()
+
+    results = await asyncio.gather(request("CUST-001", "thread-1"), request("CUST-002", "thread-2"))
+
+    assert results == [("CUST-001", "thread-1"), ("CUST-002", "thread-2")]
+
+
+@pytest.mark.asyncio
+async def test_mcp_connections_share_one_http_client_that_outlives_them():
+    async with shared_mcp_http_client_factory(headers={"accept": "text/event-stream"}) as first:
+        pass
+    async with shared_mcp_http_client_factory() as second:
+        assert second is first
+    assert not first.is_closed
+    await close_shared_http_clients()
@@ -0,0 +1,64 @@
+"""Tests for the token-caching Azure credential wrapper."""
+import asyncio
+import time
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from app.config.azure_credential import CachedTokenCredential
+
+
+class FakeCredential:
+    def __init__(self, lifetime: float = 3600):
+        self.lifetime = lifetime
+        self.calls = []
+
+    async def get_token(self, *scopes, **kwargs):
+        self.calls.append((scopes, kwargs))
+        await asyncio.sleep(0.01)
+        return AccessToken(f"token-{len(self.calls)}", int(time.time() + self.lifetime))
+
+
+@pytest.mark.asyncio
+async def test_token_is_reused_per_scope():
+    inner = FakeCredential()
+    credential = CachedTokenCredential(inner)
+
+    first = await credential.get_token("https://ai.azure.com/.default")
+    assert await credential.get_token("https://ai.azure.com/.default") is first
+    await credential.get_token("https://storage.azure.com/.default")
+
+    assert len(inner.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_refresh():
+    inner = FakeCredential()
+    credential = CachedTokenCredential(inner)
+
+    tokens = await asyncio.gather(*(credential.get_token("scope") for _ in range(5)))
+
+    assert len(inner.calls) == 1
+    assert len({token.token for token in tokens}) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_close_to_expiry_is_refreshed():
+    inner = FakeCredential(lifetime=10)
+    credential = CachedTokenCredential(inner)
+
+    await credential.get_token("scope")
+    await credential.get_token("scope")
+
+    assert len(inner.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_claims_challenge_bypasses_the_cache():
+    inner = FakeCredential()
+    credential = CachedTokenCredential(inner)
+
+    await credential.get_token("scope")
+    await credential.get_token("scope", claims="challenge")
+
+    assert inner.calls[-1] == (("scope",), {"claims": "challenge"})
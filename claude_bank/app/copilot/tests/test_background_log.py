@@ -0,0 +1,50 @@
+"""Tests for the background log queue."""
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.utils.background_log import BackgroundLogQueue, close_background_logs
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def emit(self, record):
+        self.events.extend(json.loads(record.getMessage())["batch"])
+
+
+@pytest.fixture
+def target():
+    log = logging.getLogger("tests.background_log")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    handler = RecordingHandler()
+    log.addHandler(handler)
+    yield log, handler
+    log.removeHandler(handler)
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_the_batch_being_drained(target):
+    log, handler = target
+    queue = BackgroundLogQueue(log, batch_wait=10)
+    queue.emit({"n": 1})
+    await asyncio.sleep(0.01)  # the drain task now holds the event while waiting for more
+    queue.emit({"n": 2})
+    await queue.close()
+    assert handler.events == [{"n": 1}, {"n": 2}]
+
+
+@pytest.mark.asyncio
+async def test_close_background_logs_flushes_every_queue(target):
+    log, handler = target
+    first, second = BackgroundLogQueue(log, batch_wait=10), BackgroundLogQueue(log, batch_wait=10)
+    first.emit({"queue": 1})
+    second.emit({"queue": 2})
+    await asyncio.sleep(0.01)
+    await close_background_logs()
+    assert sorted(event["queue"] for event in handler.events) == [1, 2]
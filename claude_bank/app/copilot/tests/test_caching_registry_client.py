@@ -0,0 +1,75 @@
+"""Tests for the A2A SDK's caching registry client."""
+import asyncio
+
+import pytest
+
+from a2a_sdk.client.caching_registry_client import CachingRegistryClient
+
+ACCOUNT_AGENT = {"agent_id": "account-001", "agent_name": "AccountAgent", "endpoints": {"a2a": "http://account/a2a"}}
+
+
+class FakeRegistryClient:
+    """Stands in for RegistryClient: discover() returns the configured agents per capability."""
+
+    def __init__(self, agents=None, delay=0.0):
+        self.agents = agents if agents is not None else {"account": [ACCOUNT_AGENT]}
+        self.delay = delay
+        self.discover_calls = 0
+
+    async def discover(self, capability=None, agent_type=None, status="active", tags=None):
+        self.discover_calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.agents.get(capability, []))
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_fresh_result_is_served_from_cache():
+    registry = FakeRegistryClient()
+    client = CachingRegistryClient(registry, ttl_seconds=60)
+    assert await client.discover(capability="account") == [ACCOUNT_AGENT]
+    assert await client.discover(capability="account") == [ACCOUNT_AGENT]
+    assert registry.discover_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_result_is_fetched_again():
+    registry = FakeRegistryClient()
+    client = CachingRegistryClient(registry, ttl_seconds=0.01)
+    await client.discover(capability="account")
+    await asyncio.sleep(0.02)
+    await client.discover(capability="account")
+    assert registry.discover_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch():
+    registry = FakeRegistryClient(delay=0.01)
+    client = CachingRegistryClient(registry, ttl_seconds=60)
+    results = await asyncio.gather(*(client.discover(capability="account") for _ in range(5)))
+    assert results == [[ACCOUNT_AGENT]] * 5
+    assert registry.discover_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_the_cached_capability():
+    registry = FakeRegistryClient()
+    client = CachingRegistryClient(registry, ttl_seconds=60)
+    await client.discover(capability="account")
+    client.invalidate("account")
+    await client.discover(capability="account")
+    client.invalidate()
+    await client.discover(capability="account")
+    assert registry.discover_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_empty_result_is_not_cached():
+    registry = FakeRegistryClient(agents={})
+    client = CachingRegistryClient(registry, ttl_seconds=60)
+    assert await client.discover(capability="account") == []
+    registry.agents["account"] = [ACCOUNT_AGENT]
+    assert await client.discover(capability="account") == [ACCOUNT_AGENT]
+    assert registry.discover_calls == 2
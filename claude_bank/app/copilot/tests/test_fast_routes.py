@@ -0,0 +1,50 @@
+"""Table-driven tests for the supervisor's deterministic fast routes."""
+import pytest
+
+from app.agents.azure_chat.supervisor_agent import _fast_route_name
+
+ACCOUNT = "route_to_account_agent"
+TRANSACTION = "route_to_transaction_agent"
+PAYMENT = "route_to_payment_agent"
+PRODINFO = "route_to_prodinfo_faq_agent"
+COACH = "route_to_ai_money_coach_agent"
+
+
+@pytest.mark.parametrize(
+    "user_message, expected",
+    [
+        # AccountAgent
+        ("What's my balance?", ACCOUNT),
+        ("Show my transfer limits", ACCOUNT),
+        ("What are my account details?", ACCOUNT),
+        ("Check my daily limit usage", ACCOUNT),
+        # TransactionHistoryAgent
+        ("Show transactions for last week", TRANSACTION),
+        ("How many transactions did I have?", TRANSACTION),
+        ("What's my total spending in October?", TRANSACTION),
+        ("How much did I pay in the last 3 months?", TRANSACTION),
+        ("How much did I send to Somchai last month?", TRANSACTION),
+        # PaymentAgent
+        ("Transfer 1000 THB to Nattaporn", PAYMENT),
+        ("Pay 500 to Somchai", PAYMENT),
+        ("please send 2,500 baht to Mom", PAYMENT),
+        # ProdInfoFAQAgent
+        ("What is a Current Account?", PRODINFO),
+        ("What is the minimum balance for current account?", PRODINFO),
+        ("What are the interest rates for time deposits?", PRODINFO),
+        ("What is withholding tax?", PRODINFO),
+        # AIMoneyCoachAgent
+        ("How can I manage my debt?", COACH),
+        ("Should I consolidate my loans?", COACH),
+        ("How to build an emergency fund?", COACH),
+        # Left to the LLM router
+        ("Make a transfer", None),
+        ("Send money to account 123-456-002", None),
+        ("Did my transfer of 500 to Somchai go through?", None),
+        ("Compare fixed account vs savings account", None),
+        ("Is my balance enough to pay off my debt?", None),
+        ("Hello", None),
+    ],
+)
+def test_fast_route(user_message, expected):
+    assert _fast_route_name(user_message) == expected
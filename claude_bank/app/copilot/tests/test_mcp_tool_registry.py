@@ -0,0 +1,94 @@
+"""Tests for the pooled MCP tool registry."""
+import asyncio
+
+import pytest
+
+from app.tools.mcp_tool_registry import MCPToolRegistry
+
+
+class FakeSession:
+    def __init__(self):
+        self.alive = True
+
+    async def send_ping(self):
+        if not self.alive:
+            raise ConnectionError("server went away")
+
+
+class FakeTool:
+    """Stands in for MCPStreamableHTTPTool: connect() opens a session, close() drops it."""
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.session = None
+        self.closed = False
+
+    async def connect(self):
+        self.session = FakeSession()
+
+    async def close(self):
+        self.closed = True
+        self.session = None
+
+
+def _registry(**kwargs):
+    kwargs.setdefault("heartbeat_interval", 0.01)
+    return MCPToolRegistry(**kwargs)
+
+
+def _factory(name="Account MCP server client", url="http://account"):
+    return lambda: FakeTool(name, url)
+
+
+@pytest.mark.asyncio
+async def test_get_returns_pooled_tool():
+    registry = _registry()
+    try:
+        first = await registry.get("account", "http://account", _factory())
+        second = await registry.get("account", "http://account", _factory())
+        assert first is second
+    finally:
+        await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_touched_tool_is_not_closed_as_idle():
+    registry = _registry(idle_ttl=0.05)
+    try:
+        tool = await registry.get("account", "http://account", _factory())
+        for _ in range(15):
+            registry.touch(tool)
+            await asyncio.sleep(0.01)
+        assert not tool.closed
+        assert await registry.get("account", "http://account", _factory()) is tool
+    finally:
+        await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_unused_tool_is_closed_as_idle():
+    registry = _registry(idle_ttl=0.05)
+    try:
+        tool = await registry.get("account", "http://account", _factory())
+        await asyncio.sleep(0.15)
+        assert tool.closed
+        assert await registry.get("account", "http://account", _factory()) is not tool
+    finally:
+        await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_replaces_dead_tool():
+    registry = _registry()
+    try:
+        tool = await registry.get("account", "http://account", _factory())
+        tool.session.alive = False
+        await asyncio.sleep(0.05)
+        assert tool.closed
+        replacement = await registry.get("account", "http://account", _factory())
+        assert replacement is not tool and not replacement.closed
+        # A replaced tool is no longer pooled, so touching it has no effect
+        registry.touch(tool)
+    finally:
+        await registry.close()
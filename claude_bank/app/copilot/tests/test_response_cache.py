@@ -0,0 +1,52 @@
+"""Tests for the per-thread response cache."""
+import pytest
+
+from app.cache.response_cache import ResponseCache, normalize_question
+
+
+def test_repeated_question_hits():
+    cache = ResponseCache()
+    cache.put("t1", "What is withholding tax?", "answer")
+    assert cache.lookup("t1", "  what is WITHHOLDING tax ") == "answer"
+
+
+@pytest.mark.parametrize(
+    "cached, asked",
+    [
+        (
+            "Is the savings account interest rate higher than the fixed account?",
+            "Is the fixed account interest rate higher than the savings account?",
+        ),
+        ("What is the rate for a 6 month time deposit?", "What is the rate for a 12 month time deposit?"),
+        ("Is a current account free?", "Is a current account not free?"),
+    ],
+)
+def test_different_question_with_same_words_misses(cached, asked):
+    cache = ResponseCache()
+    cache.put("t1", cached, "answer")
+    assert cache.lookup("t1", asked) is None
+
+
+def test_entries_are_scoped_per_thread():
+    cache = ResponseCache()
+    cache.put("t1", "What is withholding tax?", "answer")
+    assert cache.lookup("t2", "What is withholding tax?") is None
+
+
+def test_expired_entry_misses():
+    cache = ResponseCache(ttl_seconds=-1)
+    cache.put("t1", "What is withholding tax?", "answer")
+    assert cache.lookup("t1", "What is withholding tax?") is None
+
+
+def test_entries_per_thread_is_bounded():
+    cache = ResponseCache(entries_per_thread=2)
+    for question in ("one", "two", "three"):
+        cache.put("t1", question, question.upper())
+    assert cache.lookup("t1", "one") is None
+    assert cache.lookup("t1", "three") == "THREE"
+
+
+def test_normalize_question_keeps_word_order():
+    assert normalize_question("Fixed vs. Savings?") == "fixed vs savings"
+    assert normalize_question("Savings vs fixed") != normalize_question("Fixed vs savings")
@@ -0,0 +1,167 @@
+"""Tests for the azure_chat SupervisorAgent request handling."""
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+from agent_framework import AgentThread
+
+from app.agents.azure_chat.supervisor_agent import _REQ_CTX
+
+QUESTION = "What is withholding tax?"
+
+
+async def _stream(supervisor, user_message, thread_id):
+    chunks = [chunk async for chunk in supervisor.processMessageStream(user_message, thread_id)]
+    text = "".join(content for content, is_final, _ in chunks if not is_final)
+    return text, chunks[-1][2]
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_is_recorded_in_thread_history(supervisor, sub_agents):
+    answer, thread_id = await supervisor.processMessage(QUESTION, None)
+
+    cached, same_thread_id = await supervisor.processMessage(QUESTION, thread_id)
+
+    assert (cached, same_thread_id) == (answer, thread_id)
+    assert len(sub_agents["prodinfo_faq"].runs) == 1
+    stored = await supervisor.thread_store.get(thread_id)
+    assert stored["supervisor_thread_messages"] == 4
+    assert stored["thread_messages"] == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_serves_cached_answer(supervisor, sub_agents):
+    answer, thread_id = await supervisor.processMessage(QUESTION, None)
+
+    text, same_thread_id = await _stream(supervisor, QUESTION, thread_id)
+
+    assert (text, same_thread_id) == (answer, thread_id)
+    assert len(sub_agents["prodinfo_faq"].runs) == 1
+    stored = await supervisor.thread_store.get(thread_id)
+    assert stored["supervisor_thread_messages"] == 4
+
+
+@pytest.mark.asyncio
+async def test_streamed_answer_is_cached(supervisor, sub_agents):
+    answer, thread_id = await _stream(supervisor, QUESTION, None)
+
+    cached, _ = await supervisor.processMessage(QUESTION, thread_id)
+
+    assert cached == answer
+    assert len(sub_agents["prodinfo_faq"].runs) == 1
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_is_reused_until_it_expires(supervisor, sub_agents):
+    agent = sub_agents["account"]
+    await supervisor._get_sub_agent("account", agent)
+    await supervisor._get_sub_agent("account", agent)
+    assert agent.builds == 1
+
+    supervisor._af_sub_agents.ttl_seconds = -1
+    await supervisor._get_sub_agent("account", agent)
+    assert agent.builds == 2
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_is_rebuilt_when_an_mcp_tool_was_closed(supervisor, sub_agents):
+    agent = sub_agents["account"]
+    tool = SimpleNamespace(is_connected=True)
+    agent._local_mcp_tools = [tool]
+    await supervisor._get_sub_agent("account", agent)
+    await supervisor._get_sub_agent("account", agent)
+    assert agent.builds == 1
+
+    tool.is_connected = False
+    await supervisor._get_sub_agent("account", agent)
+    assert agent.builds == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_does_not_leak_request_context(supervisor):
+    await _stream(supervisor, "Show my account balance", None)
+
+    assert _REQ_CTX.get(None) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_do_not_share_message_or_thread(supervisor, sub_agents):
+    alice, bob = "Show my account balance, I am Alice", "Show my account balance, I am Bob"
+
+    (alice_answer, alice_thread_id), (bob_answer, bob_thread_id) = await asyncio.gather(
+        supervisor.processMessage(alice, None),
+        supervisor.processMessage(bob, None),
+    )
+
+    assert alice_answer == f"account: {alice}"
+    assert bob_answer == f"account: {bob}"
+    assert alice_thread_id != bob_thread_id
+    runs = dict(sub_agents["account"].runs)
+    assert set(runs) == {alice, bob}
+    assert runs[alice] is not runs[bob]
+    for thread_id, message in ((alice_thread_id, alice), (bob_thread_id, bob)):
+        stored = await supervisor.thread_store.get(thread_id)
+        assert str(stored["thread"]).count("I am ") == 2
+        assert message in str(stored["thread"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_new_thread_is_serialized_once_per_turn(supervisor, monkeypatch, stream):
+    serialized = []
+    original = AgentThread.serialize
+
+    async def counting_serialize(self, **kwargs):
+        serialized.append(id(self))
+        return await original(self, **kwargs)
+
+    monkeypatch.setattr(AgentThread, "serialize", counting_serialize)
+
+    if stream:
+        await _stream(supervisor, "Show my account balance", None)
+    else:
+        await supervisor.processMessage("Show my account balance", None)
+
+    # One serialize each for the shared thread and the supervisor thread
+    assert len(serialized) == 2
+    assert len(set(serialized)) == 2
+
+
+@pytest.mark.asyncio
+async def test_system_prompt_is_identical_across_turns(supervisor, chat_client):
+    # Neither message matches a fast route, so both turns call the supervisor model
+    _, thread_id = await supervisor.processMessage("Hello there", None)
+    await supervisor.processMessage("Thanks, one more thing", thread_id)
+
+    def system_hash(messages):
+        system = "".join(message.text for message in messages if message.role.value == "system")
+        return hashlib.sha256(system.encode("utf-8")).hexdigest()
+
+    assert len(chat_client.requests) == 2
+    first, second = (system_hash(messages) for messages in chat_client.requests)
+    assert first == second
+    # The system prompt leads the request so the cacheable prefix starts at the first byte
+    assert all(messages[0].role.value == "system" for messages in chat_client.requests)
+
+
+@pytest.mark.asyncio
+async def test_repeated_followup_reaches_the_sub_agent(supervisor, sub_agents):
+    _, thread_id = await supervisor.processMessage("How can I manage my debt?", None)
+    await supervisor.processMessage("yes", thread_id)
+    await supervisor.processMessage("What is good debt vs bad debt?", thread_id)
+
+    answer, _ = await supervisor.processMessage("yes", thread_id)
+
+    assert len(sub_agents["ai_money_coach"].runs) == 4
+    assert sub_agents["ai_money_coach"].runs[-1][0] == "yes"
+    assert answer == "ai_money_coach: yes"
+
+
+@pytest.mark.asyncio
+async def test_streamed_followup_is_not_cached(supervisor, sub_agents):
+    _, thread_id = await supervisor.processMessage("How can I manage my debt?", None)
+    await _stream(supervisor, "yes", thread_id)
+    await _stream(supervisor, "yes", thread_id)
+
+    assert len(sub_agents["ai_money_coach"].runs) == 3
@@ -0,0 +1,52 @@
+"""Tests for the in-memory thread store."""
+import pytest
+
+from app.cache import thread_store
+from app.cache.thread_store import InMemoryThreadStore, close_thread_store, get_thread_store
+
+STATE = {"thread": {"messages": ["hello"]}, "supervisor_thread": {"messages": []}}
+
+
+@pytest.mark.asyncio
+async def test_round_trip():
+    store = InMemoryThreadStore()
+    await store.set("t1", STATE)
+    assert await store.get("t1") == STATE
+    assert await store.get("t2") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_thread_is_dropped():
+    store = InMemoryThreadStore(ttl_seconds=-1)
+    await store.set("t1", STATE)
+    assert await store.get("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_thread_is_evicted():
+    store = InMemoryThreadStore(max_entries=2)
+    await store.set("t1", STATE)
+    await store.set("t2", STATE)
+    await store.get("t1")
+    await store.set("t3", STATE)
+    assert await store.get("t2") is None
+    assert await store.get("t1") == STATE
+
+
+@pytest.mark.asyncio
+async def test_delete():
+    store = InMemoryThreadStore()
+    await store.set("t1", STATE)
+    await store.delete("t1")
+    assert await store.get("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_close_thread_store_releases_the_singleton(monkeypatch):
+    monkeypatch.setattr(thread_store, "_thread_store", None)
+    store = get_thread_store()
+    await store.set("t1", STATE)
+    await close_thread_store()
+    assert await store.get("t1") is None
+    assert get_thread_store() is not store
+    await close_thread_store()
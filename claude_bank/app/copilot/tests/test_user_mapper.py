@@ -0,0 +1,40 @@
+"""Tests for the cached customer email lookup."""
+import pytest
+
+from app.auth import user_mapper
+from app.auth.user_mapper import DEFAULT_USER_EMAIL, lookup_customer_email
+
+
+class FakeUserMapper:
+    def __init__(self, customers):
+        self.customers = customers
+        self.lookups = 0
+
+    def get_customer_info(self, customer_id):
+        self.lookups += 1
+        return self.customers.get(customer_id)
+
+
+@pytest.fixture
+def mapper(monkeypatch):
+    fake = FakeUserMapper({
+        "CUST-001": {"customer_id": "CUST-001", "email": "somchai@example.com"},
+        "CUST-002": {"customer_id": "CUST-002", "email": None},
+    })
+    monkeypatch.setattr(user_mapper, "get_user_mapper", lambda: fake)
+    monkeypatch.setattr(user_mapper, "_email_cache", {})
+    return fake
+
+
+def test_found_email_is_cached(mapper):
+    assert lookup_customer_email("CUST-001") == "somchai@example.com"
+    assert lookup_customer_email("CUST-001") == "somchai@example.com"
+    assert mapper.lookups == 1
+
+
+def test_missing_email_falls_back_and_is_not_cached(mapper):
+    assert lookup_customer_email("CUST-002") == DEFAULT_USER_EMAIL
+    assert lookup_customer_email("CUST-404") == DEFAULT_USER_EMAIL
+    mapper.customers["CUST-002"]["email"] = "nattaporn@example.com"
+    assert lookup_customer_email("CUST-002") == "nattaporn@example.com"
+    assert mapper.lookups == 3